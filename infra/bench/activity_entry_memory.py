@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: ActivityLogEntry vs CompactActivityLogEntry.
+
+Builds N synthetic routing entries with realistic repetition (a few agents
+and channels, a pool of sessions and evidence phrases, unique input text)
+and reports traced bytes per entry for each representation.
+
+Usage: python -m infra.bench.activity_entry_memory [count] [--json]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from infra.lib.activity_log import (
+    ActivityLogEntry,
+    CompactActivityLogEntry,
+    ConfidenceLevel,
+    ContactInfo,
+    RoutingDecision,
+    SignalCategory,
+    ActionTaken,
+)
+
+AGENTS = ["orion_locke", "sandman", "oracle", "evelyn", "liaison", "research", "closer", "ic"]
+CHANNELS = ["telegram", "api", "slack", "email"]
+EVIDENCE = [
+    "Direct ask", "morning timestamp", "deal mention", "blocked keyword",
+    "follow-up", "pricing question", "intro request", "calendar reference",
+]
+SESSIONS = 2_000
+PEOPLE = 20_000
+ORGS = 2_000
+
+
+def make_entry(i: int, base: datetime) -> ActivityLogEntry:
+    """Build one entry; strings are created fresh, as a JSON parse would."""
+    confidence = 0.4 + (i % 60) / 100
+    return ActivityLogEntry(
+        id=str(uuid.UUID(int=i)),
+        timestamp=base + timedelta(seconds=i),
+        session_id=f"session-{i % SESSIONS:05d}",
+        user_id=f"user-{i % 50:03d}",
+        raw_text=f"Request {i}: what should I focus on today?",
+        source_channel="".join(CHANNELS[i % len(CHANNELS)]),
+        contact=ContactInfo(
+            person_id=f"person-{i % PEOPLE:06d}",
+            org_id=f"org-{i % ORGS:05d}",
+        ),
+        routing=RoutingDecision(
+            signal_detected=SignalCategory.RHYTHM,
+            confidence=confidence,
+            confidence_level=ConfidenceLevel.from_score(confidence),
+            evidence=["".join(EVIDENCE[i % 8]), "".join(EVIDENCE[(i // 8) % 8])],
+            target_agent="".join(AGENTS[i % len(AGENTS)]),
+            action_taken=ActionTaken.SUGGEST,
+        ),
+    )
+
+
+def measure(count: int, compact: bool) -> float:
+    """Return traced bytes per entry for `count` entries."""
+    base = datetime(2026, 1, 1)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries = []
+    for i in range(count):
+        entry = make_entry(i, base)
+        entries.append(CompactActivityLogEntry.from_entry(entry) if compact else entry)
+    del entry
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del entries
+    gc.collect()
+    return used / count
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    count = int(args[0]) if args else 1_000_000
+
+    full = measure(count, compact=False)
+    compact = measure(count, compact=True)
+    result = {
+        "count": count,
+        "python": sys.version.split()[0],
+        "full_bytes_per_entry": round(full, 1),
+        "compact_bytes_per_entry": round(compact, 1),
+        "reduction": round(full / compact, 2),
+    }
+
+    if "--json" in sys.argv:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"Entries:  {count:,}")
+    print(f"Full:     {full:,.1f} B/entry ({full * count / 2**20:,.0f} MiB)")
+    print(f"Compact:  {compact:,.1f} B/entry ({compact * count / 2**20:,.0f} MiB)")
+    print(f"Ratio:    {full / compact:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark: LeadScorer.
+
+For each book size (signals, generated by infra.bench.signal_generator)
+times calculate, batch_score (scalar and vectorized), prioritize and
+calculate_org_score, and records throughput and tracemalloc peak memory.
+Results are written as JSON tagged with the git revision, so runs from
+different versions can be compared with --compare.
+
+Usage:
+    python -m infra.bench.lead_scoring [--sizes 1k,10k,100k,1m] [--repeat N]
+        [--max-objects 1m] [--no-memory] [--output FILE] [--compare FILE]
+"""
+
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from infra.bench.signal_generator import NOW, generate
+from infra.lib.lead_scoring import LeadScorer
+from infra.lib.vector_scoring import VectorScorer
+
+DEFAULT_SIZES = "1k,10k,100k,1m"
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    if text[-1] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(fn: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, Optional[float]]:
+    """Best-of-`repeat` wall time, then one traced run for peak memory."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def bench_size(signals: int, repeat: int, max_objects: int, memory: bool) -> List[Dict[str, Any]]:
+    book = generate(signals)
+    scorer = LeadScorer()
+    results = []
+
+    def record(operation: str, items: int, fn: Callable[[], Any]):
+        m = measure(fn, repeat, memory)
+        results.append({
+            "signals": signals,
+            "operation": operation,
+            "items": items,
+            "seconds": round(m["seconds"], 6),
+            "throughput_per_s": round(items / m["seconds"], 1) if m["seconds"] else None,
+            "peak_bytes": m["peak_bytes"],
+        })
+
+    contacts = len(book.signals.contact_ids)
+    record("vector_score", signals, lambda: VectorScorer().score(book.signals, NOW))
+
+    if signals > max_objects:
+        return results
+
+    leads = book.leads()
+    record("calculate", signals, lambda: [
+        scorer.calculate(c, s, reference_time=NOW) for c, s in leads.items()
+    ])
+    record("batch_score", signals, lambda: scorer.batch_score(leads, reference_time=NOW))
+    record("batch_score_vectorized", signals, lambda: scorer.batch_score(
+        leads, reference_time=NOW, vectorized=True
+    ))
+
+    scores = scorer.batch_score(leads, reference_time=NOW, vectorized=True)
+    record("prioritize", contacts, lambda: scorer.prioritize(scores, limit=50))
+    record("prioritize_hot", contacts, lambda: scorer.prioritize(scores, limit=50, tier_filter="hot"))
+
+    by_org: Dict[str, list] = defaultdict(list)
+    for score, org_id in zip(scores, book.org_ids):
+        by_org[org_id].append(score)
+    record("calculate_org_score", contacts, lambda: [
+        scorer.calculate_org_score(org_id, members) for org_id, members in by_org.items()
+    ])
+    return results
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["signals"], r["operation"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    for r in current:
+        old = before.get((r["signals"], r["operation"]))
+        if old and old["seconds"]:
+            change = r["seconds"] / old["seconds"] - 1
+            flag = "  REGRESSION" if change > 0.10 else ""
+            print(f"  {r['signals']:>10,} {r['operation']:24s} {change:+7.1%}{flag}")
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(name: str, default: Optional[str]) -> Optional[str]:
+        if name in args:
+            return args[args.index(name) + 1]
+        return default
+
+    sizes = [parse_size(s) for s in option("--sizes", DEFAULT_SIZES).split(",")]
+    repeat = int(option("--repeat", "3"))
+    max_objects = parse_size(option("--max-objects", "1m"))
+    memory = "--no-memory" not in args
+
+    results = []
+    for size in sizes:
+        for r in bench_size(size, repeat, max_objects, memory):
+            results.append(r)
+            peak = f"{r['peak_bytes'] / 2**20:8.1f} MiB" if r["peak_bytes"] is not None else ""
+            print(f"{r['signals']:>10,} {r['operation']:24s} {r['seconds']:9.4f} s "
+                  f"{r['throughput_per_s']:>14,.0f}/s {peak}", flush=True)
+
+    report = {
+        "meta": {
+            "benchmark": "lead_scoring",
+            "git_revision": git_revision(),
+            "run_at": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    output = option("--output", None)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {output}")
+
+    baseline = option("--compare", None)
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
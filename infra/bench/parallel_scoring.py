@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark: sharded multi-process lead scoring.
+
+Builds a synthetic SignalStore (columns generated directly with numpy),
+saves it so workers can memory-map it, and times score_sharded for 1, 2,
+4 and 8 workers against the single-process VectorScorer.
+
+Usage: python -m infra.bench.parallel_scoring [contacts] [signals_per_contact] [--json]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from infra.lib.parallel_scoring import score_sharded
+from infra.lib.signal_store import SignalStore
+from infra.lib.vector_scoring import SIGNAL_TYPES, VectorScorer, to_epoch
+
+WORKERS = [1, 2, 4, 8]
+NOW = datetime(2026, 3, 1)
+
+
+def make_store(contacts: int, per_contact: int, seed: int = 38) -> SignalStore:
+    """Synthetic store: uniform contacts, types, and ages up to 180 days."""
+    rng = np.random.default_rng(seed)
+    rows = contacts * per_contact
+    store = SignalStore(capacity=0)
+    store.contact_ids = [f"contact-{i:08d}" for i in range(contacts)]
+    store.sources = ["synthetic"]
+    store._columns = {
+        "contact": rng.integers(0, contacts, rows, dtype=np.int32),
+        "signal_type": rng.integers(0, len(SIGNAL_TYPES), rows, dtype=np.uint8),
+        "timestamp": int(to_epoch(NOW)) - rng.integers(0, 180 * 86400, rows, dtype=np.int64),
+        "source": np.zeros(rows, dtype=np.uint16),
+    }
+    store._size = rows
+    return store
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    contacts = int(args[0]) if args else 1_000_000
+    per_contact = int(args[1]) if len(args) > 1 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_store(contacts, per_contact).save(tmp)
+        store = SignalStore.load(tmp)
+
+        baseline = timed(lambda: VectorScorer().score(store.to_signal_arrays(), NOW))
+        runs = {w: timed(lambda: score_sharded(store, w, NOW)) for w in WORKERS}
+
+    result = {
+        "contacts": contacts,
+        "signals": contacts * per_contact,
+        "cpus": os.cpu_count(),
+        "single_process_s": round(baseline, 3),
+        "sharded_s": {str(w): round(t, 3) for w, t in runs.items()},
+        "speedup": {str(w): round(baseline / t, 2) for w, t in runs.items()},
+    }
+
+    if "--json" in sys.argv:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"Contacts: {contacts:,}  Signals: {contacts * per_contact:,}  CPUs: {os.cpu_count()}")
+    print(f"Single process: {baseline:.2f} s")
+    for w, t in runs.items():
+        print(f"{w} worker(s):     {t:.2f} s  ({baseline / t:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark: spam phrase and disposable domain matching.
+
+For dictionaries of 100 to 10k phrases and domains, times the per-phrase
+substring scan BDRouter._is_spam used to do against PhraseMatcher (trie
+regex, and Aho-Corasick when pyahocorasick is installed) over long clean
+messages (the worst case: every scan reads the whole text), and per-entry
+substring tests against DomainSet lookups.
+
+Usage: python -m infra.bench.spam_filter [messages] [message_kb] [--json]
+"""
+
+import json
+import random
+import sys
+import time
+from typing import Callable, List
+
+from infra.lib.spam_filter import AHOCORASICK_AVAILABLE, DomainSet, PhraseMatcher
+
+SIZES = [100, 1_000, 10_000]
+
+
+def make_words(rng: random.Random, count: int) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(count)]
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    messages = int(args[0]) if args else 100
+    message_kb = int(args[1]) if len(args) > 1 else 16
+    
+    rng = random.Random(47)
+    vocabulary = make_words(rng, 5_000)
+    # Phrase words carry a digit, so they never occur in the messages
+    spam_words = [f"{w}{i % 10}" for i, w in enumerate(make_words(rng, 2_000))]
+    texts = []
+    for _ in range(messages):
+        words, size = [], 0
+        while size < message_kb * 1024:
+            words.append(rng.choice(vocabulary))
+            size += len(words[-1]) + 1
+        texts.append(" ".join(words))
+    emails = [f"{rng.choice(vocabulary)}@{rng.choice(vocabulary)}.com" for _ in range(10_000)]
+    
+    backends = ["regex"] + (["ahocorasick"] if AHOCORASICK_AVAILABLE else [])
+    results = []
+    for size in SIZES:
+        phrases = [" ".join(rng.sample(spam_words, rng.randint(1, 3))) for _ in range(size)]
+        domains = [f"{w}.com" for w in rng.sample(spam_words, min(size, len(spam_words)))]
+        domains += [f"{w}{i % 10}.net" for i, w in enumerate(make_words(rng, size - len(domains)))]
+        
+        row = {"entries": size, "messages": messages, "message_kb": message_kb}
+        row["phrases_naive_s"] = timed(lambda: [any(p in t for p in phrases) for t in texts])
+        for backend in backends:
+            build = time.perf_counter()
+            matcher = PhraseMatcher(phrases, backend=backend)
+            row[f"phrases_{backend}_build_s"] = time.perf_counter() - build
+            row[f"phrases_{backend}_s"] = timed(lambda: [matcher.search(t) for t in texts])
+            assert all(matcher.search(t) is None for t in texts[:5])
+        
+        blocked = DomainSet(domains)
+        row["domains_naive_s"] = timed(lambda: [any(d in e for d in domains) for e in emails])
+        row["domains_set_s"] = timed(lambda: [blocked.match(e) for e in emails])
+        results.append({k: round(v, 5) if isinstance(v, float) else v for k, v in row.items()})
+    
+    if "--json" in sys.argv:
+        print(json.dumps(results, indent=2))
+        return
+    
+    mib = messages * message_kb / 1024
+    print(f"{messages} messages x {message_kb} KiB ({mib:.1f} MiB), 10,000 emails")
+    for r in results:
+        print(f"\n{r['entries']:,} phrases / domains")
+        print(f"  phrases naive:        {r['phrases_naive_s']:9.3f} s")
+        for backend in backends:
+            print(f"  phrases {backend + ':':13s} {r[f'phrases_{backend}_s']:9.3f} s "
+                  f"({r['phrases_naive_s'] / r[f'phrases_{backend}_s']:.1f}x, "
+                  f"build {r[f'phrases_{backend}_build_s'] * 1000:.0f} ms)")
+        print(f"  domains naive:        {r['domains_naive_s']:9.3f} s")
+        print(f"  domains set:          {r['domains_set_s']:9.3f} s")
+
+
+if __name__ == "__main__":
+    main()
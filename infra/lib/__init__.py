@@ -6,13 +6,25 @@ Shared utilities for VoltAgent, BD Surface, and Night Shift.
 from .notion_client import NotionClient, ActivityLogger, MeshWorkLogger
 from .resource_tracker import ResourceTracker, ResourceBudget, NightShiftBudgets
 from .lead_scoring import LeadScorer, LeadScore, EngagementSignal, SignalType
+from .vector_scoring import VectorScorer, SignalArrays, ScoreArrays
+from .incremental_scoring import IncrementalScorer
+from .tier_scheduler import TierScheduler, TierChange
+from .lead_index import LeadRankIndex, OrgRollupIndex
+from .signal_store import SignalStore
+from .parallel_scoring import score_sharded
+from .score_repository import ScoreRepository
+from .score_backfill import backfill_scores, BackfillResult
+from .signal_ingest import SignalIngestor, IngestRule, LogTailer
+from .weight_tuning import WeightTuner, TuningResult
 from .activity_log import (
     BDActivityLog,
     ActivityLogEntry,
+    CompactActivityLogEntry,
     SignalCategory,
     ConfidenceLevel,
     RoutingDecision,
     ContactInfo,
+    SamplingPolicy,
 )
 from .bd_router import (
     BDRouter,
@@ -22,6 +34,10 @@ from .bd_router import (
     FunnelStage,
     IntakeStatus,
 )
+from .routing_rules import RoutingPlan, RuleSpec
+from .spam_filter import SpamFilter
+from .intake_pipeline import IntakePipeline, IntakeReport, RateLimiter
+from .intake_dedupe import IntakeDeduper, BloomFilter, ExpiringBloomFilter
 
 __all__ = [
     # Notion
@@ -37,13 +53,33 @@ __all__ = [
     "LeadScore",
     "EngagementSignal",
     "SignalType",
+    "VectorScorer",
+    "SignalArrays",
+    "ScoreArrays",
+    "IncrementalScorer",
+    "TierScheduler",
+    "TierChange",
+    "LeadRankIndex",
+    "OrgRollupIndex",
+    "SignalStore",
+    "score_sharded",
+    "ScoreRepository",
+    "backfill_scores",
+    "BackfillResult",
+    "SignalIngestor",
+    "IngestRule",
+    "LogTailer",
+    "WeightTuner",
+    "TuningResult",
     # Activity Logging
     "BDActivityLog",
     "ActivityLogEntry",
+    "CompactActivityLogEntry",
     "SignalCategory",
     "ConfidenceLevel",
     "RoutingDecision",
     "ContactInfo",
+    "SamplingPolicy",
     # BD Router
     "BDRouter",
     "RoutingRule",
@@ -51,4 +87,13 @@ __all__ = [
     "RouteDecision",
     "FunnelStage",
     "IntakeStatus",
+    "RoutingPlan",
+    "RuleSpec",
+    "SpamFilter",
+    "IntakePipeline",
+    "IntakeReport",
+    "RateLimiter",
+    "IntakeDeduper",
+    "BloomFilter",
+    "ExpiringBloomFilter",
 ]
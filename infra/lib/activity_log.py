@@ -4,10 +4,14 @@ Activity Logging System for BD Surface.
 Implements the schema from intelligence-layer.md.
 """
 
+import sys
 import uuid
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import time
+import random
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
@@ -134,6 +138,9 @@ class ActivityLogEntry:
     # Feedback
     feedback: Feedback = field(default_factory=Feedback)
     
+    # Sampling (1/keep-probability; 1.0 when never sampled)
+    sample_weight: float = 1.0
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         result = {
@@ -180,9 +187,279 @@ class ActivityLogEntry:
             "notes": self.feedback.notes,
         }
         
+        result["sample_weight"] = self.sample_weight
+        
         return result
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a repeated string (agent, channel, session, ids)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_tuple(values) -> tuple:
+    """
+    Tuple of a list of strings (evidence, cc agents), each interned.
+    
+    Only the strings are shared, not the tuple: sys.intern'd strings are
+    freed with their last reference, so this does not grow with distinct
+    lists.
+    """
+    return tuple(_intern(v) for v in values)
+
+
+class CompactActivityLogEntry:
+    """
+    Memory-compact ActivityLogEntry.
+    
+    Slots-based, with repeated strings interned and nested records packed
+    into tuples. `contact`, `routing`, `resolution` and `feedback` are built
+    on access and returned as snapshots; assign a new object to update.
+    """
+    
+    __slots__ = (
+        "id", "_ts", "session_id", "user_id", "raw_text", "source_channel",
+        "_contact", "_routing", "_resolution", "_feedback", "sample_weight",
+    )
+    
+    def __init__(
+        self,
+        id: str,
+        timestamp: datetime,
+        session_id: str = "",
+        user_id: str = "",
+        raw_text: str = "",
+        source_channel: str = "api",
+        contact: Optional[ContactInfo] = None,
+        routing: Optional[RoutingDecision] = None,
+        resolution: Optional[Resolution] = None,
+        feedback: Optional[Feedback] = None,
+        sample_weight: float = 1.0,
+    ):
+        self.id = id
+        self.timestamp = timestamp
+        self.session_id = _intern(session_id)
+        self.user_id = _intern(user_id)
+        self.raw_text = raw_text
+        self.source_channel = _intern(source_channel)
+        self.contact = contact
+        self.routing = routing
+        self.resolution = resolution
+        self.feedback = feedback
+        self.sample_weight = sample_weight
+    
+    @classmethod
+    def from_entry(cls, entry: ActivityLogEntry) -> "CompactActivityLogEntry":
+        """Pack a full ActivityLogEntry."""
+        return cls(
+            id=entry.id,
+            timestamp=entry.timestamp,
+            session_id=entry.session_id,
+            user_id=entry.user_id,
+            raw_text=entry.raw_text,
+            source_channel=entry.source_channel,
+            contact=entry.contact,
+            routing=entry.routing,
+            resolution=entry.resolution,
+            feedback=entry.feedback,
+            sample_weight=entry.sample_weight,
+        )
+    
+    def to_entry(self) -> ActivityLogEntry:
+        """Unpack into a full ActivityLogEntry."""
+        return ActivityLogEntry(
+            id=self.id,
+            timestamp=self.timestamp,
+            session_id=self.session_id,
+            user_id=self.user_id,
+            raw_text=self.raw_text,
+            source_channel=self.source_channel,
+            contact=self.contact,
+            routing=self.routing,
+            resolution=self.resolution,
+            feedback=self.feedback,
+            sample_weight=self.sample_weight,
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return self.to_entry().to_dict()
+    
+    # Naive timestamps are kept as integer microseconds since the epoch
+    @property
+    def timestamp(self) -> datetime:
+        if isinstance(self._ts, int):
+            return _EPOCH + timedelta(microseconds=self._ts)
+        return self._ts
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        if value.tzinfo is None:
+            delta = value - _EPOCH
+            self._ts = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+        else:
+            self._ts = value
+    
+    @property
+    def contact(self) -> Optional[ContactInfo]:
+        if self._contact is None:
+            return None
+        return ContactInfo(*self._contact)
+    
+    @contact.setter
+    def contact(self, value: Optional[ContactInfo]):
+        self._contact = None if value is None else (
+            _intern(value.person_id),
+            _intern(value.org_id),
+            value.org_confidence,
+        )
+    
+    @property
+    def routing(self) -> Optional[RoutingDecision]:
+        if self._routing is None:
+            return None
+        (signal, confidence, level, evidence, target, fallback,
+         cc_agents, action, protocol_id) = self._routing
+        return RoutingDecision(
+            signal_detected=signal,
+            confidence=confidence,
+            confidence_level=level,
+            evidence=list(evidence),
+            target_agent=target,
+            fallback_agent=fallback,
+            cc_agents=list(cc_agents),
+            action_taken=action,
+            protocol_id=protocol_id,
+        )
+    
+    @routing.setter
+    def routing(self, value: Optional[RoutingDecision]):
+        self._routing = None if value is None else (
+            value.signal_detected,
+            value.confidence,
+            value.confidence_level,
+            _intern_tuple(value.evidence),
+            _intern(value.target_agent),
+            _intern(value.fallback_agent),
+            _intern_tuple(value.cc_agents),
+            value.action_taken,
+            _intern(value.protocol_id),
+        )
+    
+    # Default (pending) resolution and empty feedback are stored as None
+    @property
+    def resolution(self) -> Resolution:
+        if self._resolution is None:
+            return Resolution()
+        return Resolution(*self._resolution)
+    
+    @resolution.setter
+    def resolution(self, value: Optional[Resolution]):
+        if value is None or value == Resolution():
+            self._resolution = None
+        else:
+            self._resolution = (
+                value.status,
+                _intern(value.resolved_by),
+                value.resolved_at,
+                value.outcome_summary,
+            )
+    
+    @property
+    def feedback(self) -> Feedback:
+        if self._feedback is None:
+            return Feedback()
+        return Feedback(*self._feedback)
+    
+    @feedback.setter
+    def feedback(self, value: Optional[Feedback]):
+        if value is None or value == Feedback():
+            self._feedback = None
+        else:
+            self._feedback = (
+                value.routing_correct,
+                _intern(value.user_override),
+                value.notes,
+            )
+
+
+@dataclass
+class SamplingPolicy:
+    """
+    Load-adaptive sampling for routine routing decisions.
+    
+    CLARIFY/SUGGEST, escalations and anything below `always_keep_below`
+    are always kept. Above `max_per_second` decisions/sec, high-confidence
+    ROUTE_DIRECT decisions are kept with probability max_per_second / rate
+    and carry weight 1/p so accuracy estimates stay unbiased.
+    """
+    max_per_second: float = 20.0
+    window_seconds: float = 10.0
+    always_keep_below: float = 0.95
+    min_keep_probability: float = 0.01
+
+
+class RoutingSampler:
+    """Applies a SamplingPolicy to a stream of routing decisions."""
+    
+    def __init__(
+        self,
+        policy: Optional[SamplingPolicy] = None,
+        rng: Optional[random.Random] = None,
+        clock=time.monotonic,
+    ):
+        self.policy = policy or SamplingPolicy()
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._seen: deque = deque()
+        self.kept = 0
+        self.dropped = 0
+    
+    def _rate(self) -> float:
+        """Record one decision and return decisions/sec over the window."""
+        now = self._clock()
+        self._seen.append(now)
+        cutoff = now - self.policy.window_seconds
+        while self._seen and self._seen[0] < cutoff:
+            self._seen.popleft()
+        return len(self._seen) / self.policy.window_seconds
+    
+    def is_routine(self, entry: ActivityLogEntry) -> bool:
+        """Only high-confidence direct routes are eligible for sampling."""
+        routing = entry.routing
+        return bool(
+            routing
+            and routing.action_taken == ActionTaken.ROUTE_DIRECT
+            and routing.signal_detected != SignalCategory.ESCALATION
+            and routing.confidence >= self.policy.always_keep_below
+        )
+    
+    def sample(self, entry: ActivityLogEntry) -> bool:
+        """
+        Decide whether to keep an entry.
+        
+        Sets entry.sample_weight on kept entries; returns False if dropped.
+        """
+        rate = self._rate()
+        probability = 1.0
+        if self.is_routine(entry) and rate > self.policy.max_per_second:
+            probability = max(
+                self.policy.max_per_second / rate,
+                self.policy.min_keep_probability,
+            )
+        
+        if probability < 1.0 and self._rng.random() >= probability:
+            self.dropped += 1
+            return False
+        
+        entry.sample_weight = 1.0 / probability
+        self.kept += 1
+        return True
+
+
 class BDActivityLog:
     """
     Activity logging for BD Surface.
@@ -193,11 +470,15 @@ class BDActivityLog:
         self,
         log_file: Optional[str] = None,
         sync_to_notion: bool = True,
+        sampling: Optional[SamplingPolicy] = None,
+        compact: bool = False,
     ):
         self.log_file = log_file
+        self.compact = compact
         self.sync_to_notion = sync_to_notion and NOTION_AVAILABLE
         self._notion_logger = None
         self._entries: List[ActivityLogEntry] = []
+        self.sampler = RoutingSampler(sampling) if sampling else None
         
         if self.sync_to_notion:
             try:
@@ -205,8 +486,8 @@ class BDActivityLog:
             except Exception:
                 self.sync_to_notion = False
     
-    def log_routing(
-        self,
+    @staticmethod
+    def _routing_entry(
         user_input: str,
         signal: SignalCategory,
         confidence: float,
@@ -219,17 +500,12 @@ class BDActivityLog:
         fallback_agent: Optional[str] = None,
         protocol_id: Optional[str] = None,
     ) -> ActivityLogEntry:
-        """
-        Log a routing decision.
-        
-        This is the main entry point for BD Surface to log all routing.
-        """
         conf_level = ConfidenceLevel.from_score(confidence)
         action = (ActionTaken.ROUTE_DIRECT if conf_level == ConfidenceLevel.HIGH
                   else ActionTaken.CLARIFY if conf_level == ConfidenceLevel.UNCERTAIN
                   else ActionTaken.SUGGEST)
         
-        entry = ActivityLogEntry(
+        return ActivityLogEntry(
             session_id=session_id,
             user_id=user_id,
             raw_text=user_input,
@@ -246,13 +522,66 @@ class BDActivityLog:
                 protocol_id=protocol_id,
             ),
         )
+    
+    def _admit(self, entry: ActivityLogEntry) -> Tuple[ActivityLogEntry, bool]:
+        """Apply sampling and compaction: (entry to return, whether to store it)."""
+        if self.sampler and not self.sampler.sample(entry):
+            return entry, False
+        if self.compact:
+            entry = CompactActivityLogEntry.from_entry(entry)
+        return entry, True
+    
+    def log_routing(
+        self,
+        user_input: str,
+        signal: SignalCategory,
+        confidence: float,
+        target_agent: str,
+        evidence: List[str],
+        session_id: str,
+        user_id: str = "",
+        source_channel: str = "telegram",
+        contact: Optional[ContactInfo] = None,
+        fallback_agent: Optional[str] = None,
+        protocol_id: Optional[str] = None,
+    ) -> ActivityLogEntry:
+        """
+        Log a routing decision.
         
-        self._entries.append(entry)
-        self._persist(entry)
-        self._sync_notion(entry)
-        
+        This is the main entry point for BD Surface to log all routing.
+        With a sampling policy, routine decisions dropped under load are
+        returned to the caller but not stored, persisted or synced. With
+        compact=True, entries are held as CompactActivityLogEntry.
+        """
+        entry, keep = self._admit(self._routing_entry(
+            user_input, signal, confidence, target_agent, evidence, session_id,
+            user_id, source_channel, contact, fallback_agent, protocol_id,
+        ))
+        if keep:
+            self._entries.append(entry)
+            self._persist(entry)
+            self._sync_notion(entry)
         return entry
     
+    def log_routing_many(self, decisions: Iterable[Dict[str, Any]]) -> List[ActivityLogEntry]:
+        """
+        Log many routing decisions (each a dict of log_routing arguments)
+        with one group commit: all stored entries are appended to the log
+        file in a single write. Sampling and compaction apply per entry, as
+        in log_routing. Returns the entries in input order.
+        """
+        entries, stored = [], []
+        for decision in decisions:
+            entry, keep = self._admit(self._routing_entry(**decision))
+            entries.append(entry)
+            if keep:
+                stored.append(entry)
+        self._entries.extend(stored)
+        self._persist_many(stored)
+        for entry in stored:
+            self._sync_notion(entry)
+        return entries
+    
     def resolve(
         self,
         entry_id: str,
@@ -305,10 +634,15 @@ class BDActivityLog:
     
     def _persist(self, entry: ActivityLogEntry):
         """Persist to local log file."""
-        if not self.log_file:
+        self._persist_many([entry])
+    
+    def _persist_many(self, entries: List[ActivityLogEntry]):
+        """Append entries to the local log file in one write."""
+        if not self.log_file or not entries:
             return
+        lines = "".join(json.dumps(entry.to_dict()) + "\n" for entry in entries)
         with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry.to_dict()) + "\n")
+            f.write(lines)
     
     def _sync_notion(self, entry: ActivityLogEntry):
         """Sync entry to Notion Activity Log."""
@@ -333,6 +667,9 @@ class BDActivityLog:
         """
         Calculate routing accuracy from feedback.
         Used for learning/tuning.
+        
+        Entries are weighted by sample_weight, so sampled-out routine
+        decisions are still represented in the estimate.
         """
         cutoff = datetime.utcnow() - timedelta(days=days)
         recent = [e for e in self._entries if e.timestamp >= cutoff and e.feedback.routing_correct is not None]
@@ -340,7 +677,8 @@ class BDActivityLog:
         if not recent:
             return {"sample_size": 0, "accuracy": None}
         
-        correct = sum(1 for e in recent if e.feedback.routing_correct)
+        total = sum(e.sample_weight for e in recent)
+        correct = sum(e.sample_weight for e in recent if e.feedback.routing_correct)
         
         # Break down by signal category
         by_category = {}
@@ -348,14 +686,15 @@ class BDActivityLog:
             if e.routing:
                 cat = e.routing.signal_detected.value
                 if cat not in by_category:
-                    by_category[cat] = {"correct": 0, "total": 0}
-                by_category[cat]["total"] += 1
+                    by_category[cat] = {"correct": 0.0, "total": 0.0}
+                by_category[cat]["total"] += e.sample_weight
                 if e.feedback.routing_correct:
-                    by_category[cat]["correct"] += 1
+                    by_category[cat]["correct"] += e.sample_weight
         
         return {
             "sample_size": len(recent),
-            "accuracy": correct / len(recent),
+            "weighted_sample_size": total,
+            "accuracy": correct / total,
             "by_category": {
                 k: v["correct"] / v["total"] if v["total"] > 0 else None
                 for k, v in by_category.items()
@@ -364,10 +703,6 @@ class BDActivityLog:
         }
 
 
-# Import timedelta for get_routing_accuracy
-from datetime import timedelta
-
-
 if __name__ == "__main__":
     print("Testing BD Activity Log...")
     
@@ -7,15 +7,22 @@ Created: 2026-01-31
 """
 
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 import json
 import os
 
 # Import sibling modules
 from .lead_scoring import LeadScorer, SignalType, LeadScore
-from .activity_log import BDActivityLog, ActivityLogEntry
+from .activity_log import BDActivityLog, ActivityLogEntry, ContactInfo, SignalCategory
+from .routing_rules import RuleSpec, DEFAULT_RULES_FILE, compile_ruleset, load_ruleset
+from .spam_filter import SpamFilter
+
+if TYPE_CHECKING:
+    from .intake_pipeline import IntakePipeline, IntakeReport, RateLimiter
+    from .intake_dedupe import IntakeDeduper
 
 
 class FunnelStage(Enum):
@@ -99,104 +106,59 @@ class BDRouter:
         notion_client=None,
         lead_scorer: Optional[LeadScorer] = None,
         activity_log: Optional[BDActivityLog] = None,
+        rules_file: Optional[str] = None,
+        spam_filter: Optional[SpamFilter] = None,
+        deduper: Optional["IntakeDeduper"] = None,
     ):
         self.notion = notion_client
         self.scorer = lead_scorer or LeadScorer()
         self.activity_log = activity_log
-        self.rules = self._build_default_rules()
+        self.spam_filter = spam_filter or SpamFilter()
+        self.deduper = deduper
+        self.last_report: Optional["IntakeReport"] = None
+        self.rules_file = Path(rules_file) if rules_file else DEFAULT_RULES_FILE
+        self._rules_mtime: Optional[int] = None
+        self.reload_rules(force=True)
     
-    def _build_default_rules(self) -> List[RoutingRule]:
-        """Build the default routing ruleset."""
-        return sorted([
-            # High-value signals → fast-track
-            RoutingRule(
-                name="inbound_high_value",
-                condition=lambda s: (
-                    s.get("source") == "inbound" and
-                    self._estimate_deal_size(s) >= 1_000_000
-                ),
-                decision=RouteDecision.AUTO_QUALIFY,
-                target_stage=FunnelStage.QUALIFICATION,
-                assigned_bot=self.BOT_ASSIGNMENTS["qualification"],
-                priority=100,
-            ),
-            
-            # Referral → fast-track
-            RoutingRule(
-                name="referral",
-                condition=lambda s: s.get("source") == "referral",
-                decision=RouteDecision.AUTO_QUALIFY,
-                target_stage=FunnelStage.QUALIFICATION,
-                assigned_bot=self.BOT_ASSIGNMENTS["qualification"],
-                priority=90,
-            ),
-            
-            # Known org with existing relationship
-            RoutingRule(
-                name="existing_relationship",
-                condition=lambda s: s.get("existing_contact", False),
-                decision=RouteDecision.STANDARD_TRIAGE,
-                target_stage=FunnelStage.QUALIFICATION,
-                assigned_bot=self.BOT_ASSIGNMENTS["qualification"],
-                priority=80,
-            ),
-            
-            # Inbound with clear intent
-            RoutingRule(
-                name="inbound_clear_intent",
-                condition=lambda s: (
-                    s.get("source") == "inbound" and
-                    s.get("intent_signal") in ["demo_request", "pricing_inquiry", "partnership"]
-                ),
-                decision=RouteDecision.STANDARD_TRIAGE,
-                target_stage=FunnelStage.CONTACT,
-                assigned_bot=self.BOT_ASSIGNMENTS["outreach"],
-                priority=70,
-            ),
-            
-            # Outbound research target
-            RoutingRule(
-                name="research_target",
-                condition=lambda s: s.get("source") == "research_identified",
-                decision=RouteDecision.STANDARD_TRIAGE,
-                target_stage=FunnelStage.CONTACT,
-                assigned_bot=self.BOT_ASSIGNMENTS["research"],
-                priority=60,
-            ),
-            
-            # Low-signal inbound → nurture
-            RoutingRule(
-                name="low_signal_inbound",
-                condition=lambda s: (
-                    s.get("source") == "inbound" and
-                    not s.get("intent_signal")
-                ),
-                decision=RouteDecision.NURTURE,
-                target_stage=FunnelStage.CONTACT,
-                assigned_bot=self.BOT_ASSIGNMENTS["outreach"],
-                priority=30,
-            ),
-            
-            # Spam indicators → reject
-            RoutingRule(
-                name="spam_filter",
-                condition=lambda s: self._is_spam(s),
-                decision=RouteDecision.REJECT,
-                target_stage=None,
-                assigned_bot=None,
-                priority=200,  # Check first
-            ),
-            
-            # Unclear → escalate for human review
-            RoutingRule(
-                name="escalate_unclear",
-                condition=lambda s: True,  # Catch-all
-                decision=RouteDecision.ESCALATE,
-                target_stage=FunnelStage.CONTACT,
-                assigned_bot=self.BOT_ASSIGNMENTS["qualification"],
-                priority=0,
-            ),
-        ], key=lambda r: -r.priority)
+    @property
+    def rules(self) -> List[RoutingRule]:
+        """Current ruleset in evaluation (priority) order."""
+        return self.plan.rules
+    
+    def _build_rule(self, spec: RuleSpec, condition: callable) -> RoutingRule:
+        return RoutingRule(
+            name=spec.name,
+            condition=condition,
+            decision=RouteDecision(spec.decision),
+            target_stage=FunnelStage[spec.stage] if spec.stage else None,
+            assigned_bot=self.BOT_ASSIGNMENTS.get(spec.team, spec.team) if spec.team else None,
+            priority=spec.priority,
+        )
+    
+    def reload_rules(self, force: bool = False) -> bool:
+        """
+        Recompile the ruleset if its file changed since the last load.
+        
+        The new plan replaces the old one in a single assignment, so routing
+        in progress finishes on the plan it started with. If the file does
+        not compile, the error propagates and the current plan stays.
+        
+        Returns:
+            True if a new plan was loaded
+        """
+        mtime = os.stat(self.rules_file).st_mtime_ns
+        if not force and mtime == self._rules_mtime:
+            return False
+        self.plan = compile_ruleset(
+            load_ruleset(self.rules_file),
+            functions={
+                "estimate_deal_size": self._estimate_deal_size,
+                "is_spam": self._is_spam,
+            },
+            build=self._build_rule,
+        )
+        self._rules_mtime = mtime
+        return True
     
     def _estimate_deal_size(self, submission: Dict[str, Any]) -> float:
         """Estimate potential deal size from submission data."""
@@ -215,20 +177,8 @@ class BDRouter:
         return 10_000
     
     def _is_spam(self, submission: Dict[str, Any]) -> bool:
-        """Detect spam submissions."""
-        spam_indicators = [
-            # No real company info
-            not submission.get("org_name"),
-            # Generic/disposable email
-            any(d in submission.get("email", "") for d in [
-                "mailinator", "tempmail", "throwaway", "test.com"
-            ]),
-            # Keyword spam
-            any(w in submission.get("message", "").lower() for w in [
-                "viagra", "crypto airdrop", "nigerian prince", "mlm opportunity"
-            ]),
-        ]
-        return sum(spam_indicators) >= 2
+        """Detect spam submissions (see spam_filter.SpamFilter)."""
+        return self.spam_filter.is_spam(submission)
     
     def route(self, submission: Dict[str, Any]) -> RoutingResult:
         """
@@ -236,76 +186,116 @@ class BDRouter:
         
         Args:
             submission: Dict with submission data from Intake DB
-            
+        
         Returns:
             RoutingResult with decision and routing details
         """
-        submission_id = submission.get("id", "unknown")
-        signals = []
-        
         # Apply lead scoring if we have contact history
         contact_id = submission.get("contact_id")
         lead_score = None
         if contact_id and self.scorer:
             lead_score = self.scorer.get_score(contact_id)
-            if lead_score:
-                signals.append({
-                    "type": "lead_score",
-                    "value": lead_score.total_score,
-                    "tier": lead_score.tier.value if lead_score.tier else None,
-                })
         
-        # Evaluate rules in priority order
-        for rule in self.rules:
+        result, logged = self._decide(submission, lead_score)
+        
+        # Log the decision
+        if logged and self.activity_log:
+            try:
+                self.activity_log.log_routing(**logged)
+            except Exception:
+                pass  # Don't fail routing on logging errors
+        
+        return result
+    
+    def route_many(self, submissions: List[Dict[str, Any]]) -> List[RoutingResult]:
+        """
+        Route a batch of intake submissions.
+        
+        Results come back in input order and match calling route() on each
+        (apart from timestamps). Lead scores for all contacts are fetched in
+        one repository round trip, and the batch's activity log entries are
+        written in one group commit (BDActivityLog.log_routing_many).
+        """
+        scores: Dict[str, Optional[LeadScore]] = {}
+        if self.scorer:
+            contact_ids = [s["contact_id"] for s in submissions if s.get("contact_id")]
+            if contact_ids:
+                scores = self.scorer.get_scores(contact_ids)
+        
+        decided = [
+            self._decide(s, scores.get(s["contact_id"]) if s.get("contact_id") else None)
+            for s in submissions
+        ]
+        
+        if self.activity_log:
             try:
-                if rule.condition(submission):
-                    confidence = self._calculate_confidence(submission, rule, lead_score)
-                    reasoning = self._generate_reasoning(submission, rule, signals)
-                    
-                    result = RoutingResult(
-                        submission_id=submission_id,
-                        decision=rule.decision,
-                        target_stage=rule.target_stage,
-                        assigned_bot=rule.assigned_bot,
-                        confidence=confidence,
-                        matched_rule=rule.name,
-                        reasoning=reasoning,
-                        signals=signals,
-                    )
-                    
-                    # Log the decision
-                    if self.activity_log:
-                        try:
-                            from .activity_log import SignalCategory
-                            self.activity_log.log_routing(
-                                user_input=f"Intake submission {submission_id}",
-                                signal=SignalCategory.INFORMATIONAL,
-                                confidence=confidence,
-                                target_agent=rule.assigned_bot or "unknown",
-                                evidence=[rule.name, reasoning],
-                                session_id=submission_id,
-                            )
-                        except Exception:
-                            pass  # Don't fail routing on logging errors
-                    
-                    return result
-                    
-            except Exception as e:
-                # Log error but continue to next rule
-                signals.append({"type": "rule_error", "rule": rule.name, "error": str(e)})
-                continue
+                self.activity_log.log_routing_many([logged for _, logged in decided if logged])
+            except Exception:
+                pass  # Don't fail routing on logging errors
         
-        # Should never reach here due to catch-all rule
-        return RoutingResult(
+        return [result for result, _ in decided]
+    
+    def _decide(
+        self,
+        submission: Dict[str, Any],
+        lead_score: Optional[LeadScore],
+    ) -> Tuple[RoutingResult, Optional[Dict[str, Any]]]:
+        """
+        Routing result for a submission with its lead score already looked
+        up, plus the log_routing arguments for it (None if no rule matched).
+        """
+        submission_id = submission.get("id", "unknown")
+        signals = []
+        if lead_score:
+            signals.append({
+                "type": "lead_score",
+                "value": round(lead_score.decayed_score, 1),
+                "tier": lead_score.tier,
+            })
+        
+        # First matching rule by priority (see routing_rules.RoutingPlan)
+        rule, errors = self.plan.match(submission)
+        signals.extend(errors)
+        if not rule:
+            # Should never reach here due to catch-all rule
+            return RoutingResult(
+                submission_id=submission_id,
+                decision=RouteDecision.ESCALATE,
+                target_stage=FunnelStage.CONTACT,
+                assigned_bot=self.BOT_ASSIGNMENTS["qualification"],
+                confidence=0.0,
+                matched_rule="fallback",
+                reasoning="No rules matched; escalating for human review",
+                signals=signals,
+            ), None
+        
+        confidence = self._calculate_confidence(submission, rule, lead_score)
+        reasoning = self._generate_reasoning(submission, rule, signals)
+        result = RoutingResult(
             submission_id=submission_id,
-            decision=RouteDecision.ESCALATE,
-            target_stage=FunnelStage.CONTACT,
-            assigned_bot=self.BOT_ASSIGNMENTS["qualification"],
-            confidence=0.0,
-            matched_rule="fallback",
-            reasoning="No rules matched; escalating for human review",
+            decision=rule.decision,
+            target_stage=rule.target_stage,
+            assigned_bot=rule.assigned_bot,
+            confidence=confidence,
+            matched_rule=rule.name,
+            reasoning=reasoning,
             signals=signals,
         )
+        
+        contact_id = submission.get("contact_id")
+        logged = {
+            "user_input": f"Intake submission {submission_id}",
+            "signal": SignalCategory.INTELLIGENCE,
+            "confidence": confidence,
+            "target_agent": rule.assigned_bot or "unknown",
+            "evidence": [rule.name, reasoning],
+            "session_id": submission_id,
+            "contact": ContactInfo(
+                person_id=contact_id,
+                org_id=lead_score.org_id if lead_score else None,
+            ) if contact_id else None,
+        }
+        return result, logged
     
     def _calculate_confidence(
         self,
@@ -369,63 +359,81 @@ class BDRouter:
         
         return " ".join(parts)
     
-    def process_new_submissions(self) -> List[RoutingResult]:
+    def process_new_submissions(
+        self,
+        workers: int = 4,
+        rate_limiter: Optional["RateLimiter"] = None,
+    ) -> List[RoutingResult]:
         """
         Process all new intake submissions.
         
+        Runs as a pipeline (see intake_pipeline.IntakePipeline): one query,
+        batch routing, then each submission's intake update and funnel entry
+        on a pool of `workers` threads under a shared Notion rate limit.
+        With a `deduper`, duplicate submissions skip routing and are merged
+        into the original's funnel entry or rejected. Failures are isolated
+        per submission; the full report, with per-item errors and stage
+        timings, is kept in `last_report`.
+        
         Returns:
-            List of RoutingResults for each processed submission
+            List of RoutingResults for each routed submission, in query order
         """
         if not self.notion:
             raise ValueError("Notion client required for batch processing")
         
-        # Query Intake DB for new submissions
-        new_submissions = self.notion.query_database(
-            self.INTAKE_SUBMISSIONS_DB,
-            filter={
-                "property": "Status",
-                "select": {"equals": IntakeStatus.NEW.value}
-            }
-        )
-        
-        results = []
-        for submission in new_submissions:
-            # Extract submission data from Notion page
-            sub_data = self._extract_submission_data(submission)
-            
-            # Route it
-            result = self.route(sub_data)
-            results.append(result)
-            
-            # Update Intake status
-            new_status = (
-                IntakeStatus.REJECTED if result.decision == RouteDecision.REJECT
-                else IntakeStatus.TRIAGED
-            )
-            self.notion.update_page(
-                submission["id"],
-                properties={
-                    "Status": {"select": {"name": new_status.value}},
-                    "Routing Decision": {"rich_text": [{"text": {"content": result.reasoning[:200]}}]},
-                    "Routed At": {"date": {"start": result.timestamp}},
-                }
-            )
-            
-            # Create Funnel entry if not rejected
-            if result.decision != RouteDecision.REJECT and result.target_stage:
-                self.notion.create_page(
-                    self.FUNNEL_TRACKER_DB,
-                    properties={
-                        "Name": {"title": [{"text": {"content": sub_data.get("org_name", "Unknown")}}]},
-                        "Stage": {"select": {"name": result.target_stage.value}},
-                        "Owner": {"relation": []},  # TODO: map assigned_bot to VT relation
-                        "Source Submission": {"relation": [{"id": submission["id"]}]},
-                        "Routing Confidence": {"number": result.confidence},
-                        "Created": {"date": {"start": result.timestamp}},
-                    }
-                )
+        # Pick up ruleset edits between batches
+        self.reload_rules()
         
-        return results
+        from .intake_pipeline import IntakePipeline
+        self.last_report = IntakePipeline(self, workers=workers, rate_limiter=rate_limiter).run()
+        return self.last_report.results
+    
+    @staticmethod
+    def intake_filter() -> Dict[str, Any]:
+        """Notion filter for intake submissions awaiting routing."""
+        return {
+            "property": "Status",
+            "select": {"equals": IntakeStatus.NEW.value}
+        }
+    
+    @staticmethod
+    def _intake_properties(result: RoutingResult) -> Dict[str, Any]:
+        """Intake page update recording a routing result."""
+        new_status = (
+            IntakeStatus.REJECTED if result.decision == RouteDecision.REJECT
+            else IntakeStatus.TRIAGED
+        )
+        return {
+            "Status": {"select": {"name": new_status.value}},
+            "Routing Decision": {"rich_text": [{"text": {"content": result.reasoning[:200]}}]},
+            "Routed At": {"date": {"start": result.timestamp}},
+        }
+    
+    @staticmethod
+    def _needs_funnel_entry(result: RoutingResult) -> bool:
+        """Create Funnel entry if not rejected."""
+        return result.decision != RouteDecision.REJECT and result.target_stage is not None
+    
+    @staticmethod
+    def _funnel_properties(
+        submission_page_id: str,
+        sub_data: Dict[str, Any],
+        result: RoutingResult,
+    ) -> Dict[str, Any]:
+        """Funnel Tracker page for a routed submission."""
+        return {
+            "Name": {"title": [{"text": {"content": sub_data.get("org_name") or "Unknown"}}]},
+            "Stage": {"select": {"name": result.target_stage.value}},
+            "Owner": {"relation": []},  # TODO: map assigned_bot to VT relation
+            "Source Submission": {"relation": [{"id": submission_page_id}]},
+            "Routing Confidence": {"number": result.confidence},
+            "Created": {"date": {"start": result.timestamp}},
+        }
+    
+    @staticmethod
+    def _funnel_sources_properties(submission_page_ids: List[str]) -> Dict[str, Any]:
+        """Funnel Tracker update linking every intake page merged into the entry."""
+        return {"Source Submission": {"relation": [{"id": page_id} for page_id in submission_page_ids]}}
     
     def _extract_submission_data(self, notion_page: Dict[str, Any]) -> Dict[str, Any]:
         """Extract submission fields from Notion page properties."""
@@ -484,3 +492,67 @@ if __name__ == "__main__":
     print(f"Assigned: {result.assigned_bot}")
     print(f"Confidence: {result.confidence:.2f}")
     print(f"Reasoning: {result.reasoning}")
+    
+    # Batch routing matches per-item routing, with one log write per batch
+    import random
+    import tempfile
+    import time
+    from datetime import timedelta
+    from .lead_scoring import EngagementSignal
+    from .score_repository import ScoreRepository
+    
+    rng = random.Random(48)
+    now = datetime.utcnow()
+    repo = ScoreRepository(":memory:")
+    scorer = LeadScorer(repository=repo)
+    for i in range(300):
+        for _ in range(rng.randint(1, 6)):
+            scorer.record_signal(
+                f"contact-{i:03d}",
+                EngagementSignal(rng.choice(list(SignalType)), now - timedelta(days=rng.uniform(0, 60))),
+                org_id=f"org-{i % 40}",
+            )
+    batch = [
+        {
+            "id": f"sub-{i:05d}",
+            "org_name": rng.choice(["Acme Corp", "Globex", None]),
+            "email": rng.choice(["ceo@acme.com", "x@mailinator.com"]),
+            "source": rng.choice(["inbound", "referral", "research_identified", "event"]),
+            "intent_signal": rng.choice(["demo_request", "partnership", None]),
+            "contact_id": rng.choice([f"contact-{rng.randrange(400):03d}", None]),
+            "org_employee_count": rng.choice([5, 500, 5000]),
+        }
+        for i in range(5000)
+    ]
+    
+    def fields(r: RoutingResult):
+        return (r.submission_id, r.decision, r.target_stage, r.assigned_bot,
+                r.confidence, r.matched_rule, r.reasoning, r.signals)
+    
+    def log_lines(path):
+        with open(path) as f:
+            entries = [json.loads(line) for line in f]
+        return [(e["session_id"], e["input"], e.get("contact"), e["routing"]) for e in entries]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        single_log = BDActivityLog(os.path.join(tmp, "single.jsonl"), sync_to_notion=False)
+        batch_log = BDActivityLog(os.path.join(tmp, "batch.jsonl"), sync_to_notion=False)
+        single_router = BDRouter(lead_scorer=scorer, activity_log=single_log)
+        batch_router = BDRouter(lead_scorer=scorer, activity_log=batch_log)
+        
+        repo.invalidate()
+        start = time.perf_counter()
+        one_by_one = [single_router.route(s) for s in batch]
+        single_time = time.perf_counter() - start
+        
+        repo.invalidate()
+        start = time.perf_counter()
+        together = batch_router.route_many(batch)
+        batch_time = time.perf_counter() - start
+        
+        assert [fields(r) for r in one_by_one] == [fields(r) for r in together]
+        assert log_lines(single_log.log_file) == log_lines(batch_log.log_file)
+        assert len(batch_log._entries) == len(batch)
+    
+    print(f"\n{len(batch)} submissions: route {single_time * 1000:.0f} ms, "
+          f"route_many {batch_time * 1000:.0f} ms")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Incremental Lead Scoring for BD Surface.
+Keeps each contact's decayed score as an anchored running sum so adding a
+signal or reading the score at a later time does not rescan history.
+"""
+
+import heapq
+import itertools
+import math
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple
+from dataclasses import dataclass, field
+
+from .lead_scoring import (
+    LeadScorer,
+    LeadScore,
+    EngagementSignal,
+    ScoringWeights,
+    SignalType,
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# (timestamp, seq, weight, signal_type); seq preserves insertion order for ties
+_Entry = Tuple[datetime, int, int, SignalType]
+
+
+@dataclass
+class _ContactState:
+    """Running totals for one contact."""
+    org_id: Optional[str] = None
+    anchor: Optional[datetime] = None     # time of the last read
+    decayed: float = 0.0                  # Σ w·decay of active signals at anchor
+    boosted: float = 0.0                  # same sum over the recency window only
+    raw_score: float = 0.0
+    signal_count: int = 0
+    last_activity: Optional[datetime] = None
+    pending_weight: int = 0               # Σ w of signals newer than anchor
+    pending: List[_Entry] = field(default_factory=list)    # heap by timestamp
+    window: List[_Entry] = field(default_factory=list)     # heap by timestamp
+    top_expired: List[Tuple[float, int, _Entry]] = field(default_factory=list)
+
+
+class IncrementalScorer:
+    """
+    Stateful counterpart to LeadScorer.calculate.
+    
+    Because decay is a pure half-life, Σ w·0.5^((t - ts)/h) can be carried
+    forward from an anchor time by a single multiplication. Signals inside
+    the recency window are also tracked in a heap so their boost is removed
+    exactly when (t - ts) crosses recency_boost_days; signals newer than the
+    read time count at full weight with boost, as in calculate().
+    
+    Reads per contact must be monotone in time: score_at() moves the anchor
+    forward and expired boosts cannot be restored.
+    """
+    
+    def __init__(self, weights: Optional[ScoringWeights] = None):
+        self.scorer = LeadScorer(weights)
+        self.weights = self.scorer.weights
+        self._contacts: Dict[str, _ContactState] = {}
+        self._seq = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._contacts)
+    
+    def __contains__(self, contact_id: str) -> bool:
+        return contact_id in self._contacts
+    
+    def contact_ids(self) -> List[str]:
+        return list(self._contacts)
+    
+    def _boost_expired(self, timestamp: datetime, now: datetime) -> bool:
+        """Mirror of LeadScorer._recency_multiplier's window test."""
+        age_days = (now - timestamp).total_seconds() / 86400
+        return age_days > self.weights.recency_boost_days
+    
+    def _decay(self, start: datetime, end: datetime) -> float:
+        return self.scorer._decay_factor((end - start).total_seconds() / 86400)
+    
+    def _rank_key(self, entry: _Entry) -> float:
+        """Time-invariant log2 contribution of a signal outside the window."""
+        timestamp, _, weight, _ = entry
+        if weight <= 0:
+            return -math.inf
+        age_days = (timestamp - _EPOCH).total_seconds() / 86400
+        return math.log2(weight) + age_days / self.weights.decay_half_life_days
+    
+    def _keep_top(self, state: _ContactState, entry: _Entry):
+        """Track the three largest expired contributions (order never changes)."""
+        item = (-self._rank_key(entry), entry[1], entry)
+        top = state.top_expired
+        if len(top) < 3 or item < top[-1]:
+            top.append(item)
+            top.sort()
+            del top[3:]
+    
+    def _activate(self, state: _ContactState, entry: _Entry):
+        """Fold a signal with timestamp <= anchor into the anchored sums."""
+        timestamp, _, weight, _ = entry
+        value = weight * self._decay(timestamp, state.anchor)
+        state.decayed += value
+        if self._boost_expired(timestamp, state.anchor):
+            self._keep_top(state, entry)
+        else:
+            state.boosted += value
+            heapq.heappush(state.window, entry)
+    
+    def add_signal(
+        self,
+        contact_id: str,
+        signal: EngagementSignal,
+        org_id: Optional[str] = None,
+    ):
+        """Record a signal for a contact. O(log w) for w signals in the window."""
+        state = self._contacts.get(contact_id)
+        if state is None:
+            state = self._contacts[contact_id] = _ContactState()
+        if org_id is not None:
+            state.org_id = org_id
+        
+        weight = self.weights.get_weight(signal.signal_type)
+        entry = (signal.timestamp, next(self._seq), weight, signal.signal_type)
+        state.raw_score += weight
+        state.signal_count += 1
+        if state.last_activity is None or signal.timestamp > state.last_activity:
+            state.last_activity = signal.timestamp
+        
+        if state.anchor is None or signal.timestamp > state.anchor:
+            heapq.heappush(state.pending, entry)
+            state.pending_weight += weight
+        else:
+            self._activate(state, entry)
+    
+    def _advance(self, contact_id: str, now: datetime) -> Optional[_ContactState]:
+        state = self._contacts.get(contact_id)
+        if state is None:
+            return None
+        if state.anchor is not None:
+            if now < state.anchor:
+                raise ValueError(
+                    f"Reads must be monotone: {now.isoformat()} is before "
+                    f"{state.anchor.isoformat()} for {contact_id}"
+                )
+            factor = self._decay(state.anchor, now)
+            state.decayed *= factor
+            state.boosted *= factor
+        state.anchor = now
+        
+        while state.pending and state.pending[0][0] <= now:
+            entry = heapq.heappop(state.pending)
+            state.pending_weight -= entry[2]
+            self._activate(state, entry)
+        
+        while state.window and self._boost_expired(state.window[0][0], now):
+            entry = heapq.heappop(state.window)
+            state.boosted -= entry[2] * self._decay(entry[0], now)
+            self._keep_top(state, entry)
+        if not state.window:
+            state.boosted = 0.0
+        
+        return state
+    
+    def decayed_score_at(self, contact_id: str, now: datetime) -> float:
+        """Decayed score only; amortized O(1) per call."""
+        state = self._advance(contact_id, now)
+        if state is None:
+            return 0.0
+        multiplier = self.weights.recency_boost_multiplier
+        return (
+            state.decayed
+            + (multiplier - 1) * state.boosted
+            + multiplier * state.pending_weight
+        )
+    
+    def projection(
+        self,
+        contact_id: str,
+        now: datetime,
+    ) -> Tuple[float, float, Optional[datetime]]:
+        """
+        Closed form of the score from `now` on: until `next_change`, the
+        score at now + d days is decaying * 0.5 ** (d / half_life) + constant.
+        next_change is when a recency boost lapses or a future-dated signal
+        starts decaying (None if neither is pending).
+        """
+        state = self._advance(contact_id, now)
+        if state is None:
+            return 0.0, 0.0, None
+        multiplier = self.weights.recency_boost_multiplier
+        changes = []
+        if state.window:
+            # Boost applies while age <= recency_boost_days, so it lapses just after
+            changes.append(
+                state.window[0][0]
+                + timedelta(days=self.weights.recency_boost_days, microseconds=1)
+            )
+        if state.pending:
+            changes.append(state.pending[0][0])
+        return (
+            state.decayed + (multiplier - 1) * state.boosted,
+            multiplier * state.pending_weight,
+            min(changes) if changes else None,
+        )
+    
+    def score_at(self, contact_id: str, now: datetime) -> LeadScore:
+        """
+        Full LeadScore at `now`, equivalent to calculate() over every signal
+        added so far. Top signals are picked from the three largest expired
+        contributions plus the signals still inside the recency window.
+        """
+        decayed = self.decayed_score_at(contact_id, now)
+        state = self._contacts.get(contact_id)
+        if state is None or not state.signal_count:
+            return self.scorer.calculate(contact_id, [], reference_time=now)
+        
+        candidates = [item[2] for item in state.top_expired]
+        candidates.extend(state.window)
+        candidates.extend(state.pending)
+        contributions = []
+        for timestamp, seq, weight, signal_type in candidates:
+            age_days = (now - timestamp).total_seconds() / 86400
+            value = (
+                weight
+                * self.scorer._decay_factor(age_days)
+                * self.scorer._recency_multiplier(timestamp, now)
+            )
+            contributions.append((-value, seq, signal_type.value))
+        contributions.sort()
+        
+        return LeadScore(
+            contact_id=contact_id,
+            org_id=state.org_id,
+            raw_score=state.raw_score,
+            decayed_score=decayed,
+            tier=self.scorer._get_tier(decayed),
+            signal_count=state.signal_count,
+            last_activity=state.last_activity,
+            top_signals=[c[2] for c in contributions[:3]],
+        )
+
+
+if __name__ == "__main__":
+    import random
+    
+    print("Testing Incremental Lead Scoring...")
+    
+    # Randomized equivalence check against LeadScorer.calculate
+    rng = random.Random(35)
+    signal_types = list(SignalType)
+    scorer = LeadScorer()
+    start = datetime(2026, 1, 1)
+    checks = 0
+    
+    for trial in range(300):
+        incremental = IncrementalScorer()
+        history: List[EngagementSignal] = []
+        now = start
+        for _ in range(rng.randint(1, 40)):
+            if rng.random() < 0.6:
+                # Mostly recent signals, some backdated or slightly in the future
+                offset = rng.choice([
+                    rng.uniform(-2, 0.5),
+                    rng.uniform(0, 45),
+                    7.0,                      # exactly on the boost boundary
+                ])
+                signal = EngagementSignal(
+                    rng.choice(signal_types),
+                    now - timedelta(days=offset),
+                )
+                history.append(signal)
+                incremental.add_signal("contact", signal)
+            else:
+                now += timedelta(days=rng.choice([0, rng.uniform(0, 3), 7, rng.uniform(0, 40)]))
+                expected = scorer.calculate("contact", history, reference_time=now)
+                got = incremental.score_at("contact", now)
+                assert abs(expected.decayed_score - got.decayed_score) <= 1e-9 * max(1.0, expected.decayed_score), \
+                    (trial, expected.decayed_score, got.decayed_score)
+                assert expected.raw_score == got.raw_score
+                assert expected.tier == got.tier
+                assert expected.signal_count == got.signal_count
+                assert expected.last_activity == got.last_activity
+                assert expected.top_signals == got.top_signals, (trial, expected.top_signals, got.top_signals)
+                checks += 1
+    
+    print(f"\n{checks} randomized reads match LeadScorer.calculate")
+    
+    try:
+        incremental.score_at("contact", now - timedelta(seconds=1))
+        raise AssertionError("non-monotone read accepted")
+    except ValueError:
+        pass
+    
+    print("\n✓ Incremental scoring working")
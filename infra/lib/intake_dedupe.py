@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Intake Duplicate Suppression for BD Surface.
+Recognizes resubmissions and repeat submitters before routing, so they are
+merged into the existing funnel entry or rejected without a fresh route.
+"""
+
+import hashlib
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from .bd_router import BDRouter, RoutingResult, RouteDecision
+
+# Shared mailbox providers: their domain says nothing about the org
+FREE_MAIL_DOMAINS = frozenset({
+    "aol.com", "gmail.com", "googlemail.com", "gmx.com", "hotmail.com", "icloud.com",
+    "live.com", "mail.com", "me.com", "msn.com", "outlook.com", "proton.me",
+    "protonmail.com", "yahoo.com", "yandex.com", "zoho.com",
+})
+ORG_SUFFIXES = frozenset({
+    "ag", "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated",
+    "limited", "llc", "llp", "lp", "ltd", "plc", "sa", "the",
+})
+# Shorter messages ("Interested", "Demo please") are too common to fingerprint
+MIN_MESSAGE_LENGTH = 40
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercased address without +tags (and without dots for Gmail)."""
+    if not email or "@" not in email:
+        return None
+    local, _, domain = email.strip().lower().rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local and domain else None
+
+
+def normalize_org(name: Optional[str]) -> Optional[str]:
+    """Org name without case, punctuation or legal suffixes ("Acme, Inc." → "acme")."""
+    if not name:
+        return None
+    words = [w for w in re.findall(r"[a-z0-9]+", name.lower()) if w not in ORG_SUFFIXES]
+    return " ".join(words) or None
+
+
+def message_hash(message: Optional[str]) -> Optional[str]:
+    """Hash of the whitespace/case-normalized message, if long enough to be distinctive."""
+    if not message:
+        return None
+    text = " ".join(message.lower().split())
+    if len(text) < MIN_MESSAGE_LENGTH:
+        return None
+    return hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+
+
+@dataclass
+class Fingerprint:
+    """Normalized identity of a submission."""
+    email: Optional[str]
+    domain: Optional[str]     # org email domain; None for free-mail providers
+    org: Optional[str]
+    message: Optional[str]    # message_hash
+    
+    @classmethod
+    def of(cls, submission: Dict[str, Any]) -> "Fingerprint":
+        email = normalize_email(submission.get("email"))
+        domain = email.rpartition("@")[2] if email else None
+        return cls(
+            email=email,
+            domain=None if domain in FREE_MAIL_DOMAINS else domain,
+            org=normalize_org(submission.get("org_name")),
+            message=message_hash(submission.get("message")),
+        )
+    
+    def keys(self) -> List[str]:
+        """Keys identifying the same submitter: person, then org."""
+        keys = []
+        if self.email:
+            keys.append(f"email:{self.email}")
+        if self.org or self.domain:
+            keys.append(f"org:{self.org or ''}|{self.domain or ''}")
+        return keys
+    
+    def reject_keys(self) -> List[str]:
+        """Keys remembered for rejected submissions: sender, and message for bots rotating senders."""
+        keys = []
+        if self.email:
+            keys.append(f"email:{self.email}")
+        if self.message:
+            keys.append(f"msg:{self.message}")
+        return keys
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter persisted as a small header plus the bit array.
+    
+    Sized for `capacity` keys at `error_rate` false positives; positions
+    come from double hashing one blake2b digest.
+    """
+    
+    MAGIC = b"BDBLOOM1"
+    
+    def __init__(self, capacity: int = 200_000, error_rate: float = 1e-6):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+    
+    def add(self, key: str):
+        if key in self:
+            return
+        for p in self._positions(key):
+            self._bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def write(self, f):
+        f.write(self.MAGIC)
+        for value in (self.size, self.hashes, self.count):
+            f.write(value.to_bytes(8, "little"))
+        f.write(self._bits)
+    
+    @classmethod
+    def read(cls, f, name: str = "stream") -> "BloomFilter":
+        if f.read(len(cls.MAGIC)) != cls.MAGIC:
+            raise ValueError(f"{name} is not a Bloom filter file")
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hashes, bloom.count = (int.from_bytes(f.read(8), "little") for _ in range(3))
+        bloom._bits = bytearray(f.read((bloom.size + 7) // 8))
+        if len(bloom._bits) != (bloom.size + 7) // 8:
+            raise ValueError(f"{name} is truncated")
+        return bloom
+    
+    def save(self, path: Path):
+        """Write atomically (temp file + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            self.write(f)
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        with open(path, "rb") as f:
+            return cls.read(f, str(path))
+
+
+class ExpiringBloomFilter:
+    """
+    Bloom filter whose keys expire, kept as two generations of `ttl` each.
+    
+    Keys go into the current generation; once it is `ttl` old it becomes
+    the previous one (dropping the older) and a fresh generation starts.
+    Lookups check both, so a key is remembered for at least `ttl` and at
+    most 2 × `ttl`, and false positives clear with their generation.
+    Both generations persist in one file.
+    """
+    
+    MAGIC = b"BDBLOOMG"
+    
+    def __init__(self, ttl: timedelta, capacity: int = 200_000, error_rate: float = 1e-6,
+                 started: Optional[datetime] = None):
+        self.ttl = ttl
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Newest first: (generation start, filter)
+        self.generations: List[Tuple[datetime, BloomFilter]] = [
+            (started or datetime.utcnow(), BloomFilter(capacity, error_rate))
+        ]
+    
+    def rotate(self, now: datetime) -> bool:
+        """Start a new generation if the current one is `ttl` old; True if anything changed."""
+        started, current = self.generations[0]
+        elapsed = (now - started) // self.ttl
+        if elapsed < 1:
+            return False
+        # Generations stay aligned to the first start, so idle periods do not stretch lifetimes
+        fresh = (started + elapsed * self.ttl, BloomFilter(self.capacity, self.error_rate))
+        self.generations = [fresh, (started, current)] if elapsed == 1 else [fresh]
+        return True
+    
+    def add(self, key: str):
+        if key not in self:
+            self.generations[0][1].add(key)
+    
+    def __contains__(self, key: str) -> bool:
+        return any(key in bloom for _, bloom in self.generations)
+    
+    def __len__(self) -> int:
+        return sum(len(bloom) for _, bloom in self.generations)
+    
+    def save(self, path: Path):
+        """Write atomically (temp file + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(len(self.generations).to_bytes(8, "little"))
+            for started, bloom in self.generations:
+                f.write(started.isoformat().encode().ljust(32))
+                bloom.write(f)
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: Path, ttl: timedelta, capacity: int = 200_000, error_rate: float = 1e-6,
+             now: Optional[datetime] = None) -> "ExpiringBloomFilter":
+        """
+        Load saved generations. A plain BloomFilter file (from before rejects
+        expired) becomes a single generation starting `now`.
+        """
+        expiring = cls(ttl, capacity, error_rate, started=now)
+        with open(path, "rb") as f:
+            magic = f.read(len(cls.MAGIC))
+            if magic == BloomFilter.MAGIC:
+                f.seek(0)
+                expiring.generations = [(expiring.generations[0][0], BloomFilter.read(f, str(path)))]
+                return expiring
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not an expiring Bloom filter file")
+            count = int.from_bytes(f.read(8), "little")
+            expiring.generations = [
+                (datetime.fromisoformat(f.read(32).decode().strip()), BloomFilter.read(f, str(path)))
+                for _ in range(count)
+            ]
+        if not expiring.generations:
+            raise ValueError(f"{path} is truncated")
+        return expiring
+
+
+@dataclass
+class SeenSubmission:
+    """The first submission of a submitter within the window, and what it became."""
+    submission_id: str
+    first_seen: datetime
+    last_seen: datetime
+    result: Optional[RoutingResult] = None    # None while its own batch is being routed
+    funnel_page_id: Optional[str] = None
+    sources: List[str] = field(default_factory=list)   # intake pages merged into the entry
+    
+    @property
+    def rejected(self) -> bool:
+        return self.result is not None and self.result.decision == RouteDecision.REJECT
+
+
+@dataclass
+class DedupeMatch:
+    """A submission recognized as a duplicate."""
+    action: str                            # "merge" or "reject"
+    reason: str
+    original: Optional[SeenSubmission]     # None for Bloom-only reject hits
+    
+    def result(self, submission_id: str) -> RoutingResult:
+        """Routing result standing in for route() on the duplicate."""
+        original = self.original
+        if self.action == "reject":
+            source = f"submission {original.submission_id}" if original else "a previously rejected submission"
+            return RoutingResult(
+                submission_id=submission_id,
+                decision=RouteDecision.REJECT,
+                target_stage=None,
+                assigned_bot=None,
+                confidence=original.result.confidence if original and original.result else 0.9,
+                matched_rule="duplicate_reject",
+                reasoning=f"Duplicate ({self.reason}) of {source}, which was rejected.",
+                signals=[{"type": "duplicate_of", "value": original.submission_id if original else None}],
+            )
+        prior = original.result
+        return RoutingResult(
+            submission_id=submission_id,
+            decision=prior.decision,
+            target_stage=prior.target_stage,
+            assigned_bot=prior.assigned_bot,
+            confidence=prior.confidence,
+            matched_rule="duplicate_merge",
+            reasoning=(
+                f"Duplicate ({self.reason}) of submission {original.submission_id}; "
+                f"merged into its funnel entry."
+            ),
+            signals=[{"type": "duplicate_of", "value": original.submission_id}],
+        )
+
+
+class IntakeDeduper:
+    """
+    Recognizes duplicate intake submissions ahead of routing.
+    
+    The first submission per person (normalized email) and per org
+    (normalized name + non-free-mail domain) is kept in a bounded LRU for
+    `window`. Later submissions matching one are merged into its funnel
+    entry, or rejected if it was rejected. Sender and message fingerprints
+    of every rejected submission also go into an ExpiringBloomFilter
+    persisted at `path`, so spam resubmissions are short-circuited across
+    restarts and after LRU eviction; those fingerprints expire after one
+    to two windows. The LRU is in-memory only.
+    """
+    
+    DEFAULT_PATH = Path(os.path.expanduser("~/.cache/bd-surface/intake_rejects.bloom"))
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 50_000,
+        window: timedelta = timedelta(days=30),
+        bloom_capacity: int = 200_000,
+        bloom_error_rate: float = 1e-6,
+        clock=datetime.utcnow,
+    ):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        self._seen: "OrderedDict[str, SeenSubmission]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "new": 0, "merged": 0, "rejected": 0, "bloom_rejects": 0, "evictions": 0}
+        self._dirty = False
+        now = clock()
+        self.rejects = (
+            ExpiringBloomFilter.load(self.path, window, bloom_capacity, bloom_error_rate, now=now)
+            if self.path.exists()
+            else ExpiringBloomFilter(window, bloom_capacity, bloom_error_rate, started=now)
+        )
+    
+    def _lookup(self, key: str, now: datetime) -> Optional[SeenSubmission]:
+        seen = self._seen.get(key)
+        if seen is None:
+            return None
+        if now - seen.last_seen > self.window:
+            del self._seen[key]
+            return None
+        self._seen.move_to_end(key)
+        return seen
+    
+    def check(self, submission: Dict[str, Any]) -> Optional[DedupeMatch]:
+        """
+        Duplicate match for a submission, or None if it should be routed.
+        
+        A submission that is not a duplicate is remembered straight away
+        (pending until resolve()), so later copies in the same batch
+        match it.
+        """
+        fingerprint = Fingerprint.of(submission)
+        now = self.clock()
+        with self._lock:
+            self._stats["checked"] += 1
+            for key, reason in zip(fingerprint.keys(), ("same email", "same org")):
+                seen = self._lookup(key, now)
+                if seen is None:
+                    continue
+                if seen.rejected:
+                    self._stats["rejected"] += 1
+                    return DedupeMatch("reject", reason, seen)
+                if seen.result is None or seen.funnel_page_id or not BDRouter._needs_funnel_entry(seen.result):
+                    seen.last_seen = now
+                    self._stats["merged"] += 1
+                    return DedupeMatch("merge", reason, seen)
+                # Original never got its funnel entry: route this one afresh
+                break
+            if self.rejects.rotate(now):
+                self._dirty = True
+            for key in fingerprint.reject_keys():
+                if key in self.rejects:
+                    self._stats["bloom_rejects"] += 1
+                    return DedupeMatch("reject", "matches a rejected sender or message", None)
+            
+            self._stats["new"] += 1
+            seen = SeenSubmission(
+                submission_id=submission.get("id", "unknown"),
+                first_seen=now,
+                last_seen=now,
+                sources=[submission.get("id", "unknown")],
+            )
+            for key in fingerprint.keys():
+                self._seen[key] = seen
+                self._seen.move_to_end(key)
+            while len(self._seen) > self.capacity:
+                self._seen.popitem(last=False)
+                self._stats["evictions"] += 1
+            return None
+    
+    def _own(self, submission: Dict[str, Any]) -> List[Tuple[str, SeenSubmission]]:
+        """LRU entries created by check() for this very submission."""
+        submission_id = submission.get("id", "unknown")
+        return [
+            (key, self._seen[key]) for key in Fingerprint.of(submission).keys()
+            if key in self._seen and self._seen[key].submission_id == submission_id
+        ]
+    
+    def resolve(self, submission: Dict[str, Any], result: RoutingResult) -> Optional[SeenSubmission]:
+        """
+        Record how a new submission was routed; rejects enter the reject filter.
+        
+        Returns:
+            The submission's entry, to link() its funnel page to
+        """
+        with self._lock:
+            own = self._own(submission)
+            for _, seen in own:
+                seen.result = result
+            if result.decision == RouteDecision.REJECT:
+                self.rejects.rotate(self.clock())
+                for key in Fingerprint.of(submission).reject_keys():
+                    self.rejects.add(key)
+                self._dirty = True
+            return own[0][1] if own else None
+    
+    def forget(self, submission: Dict[str, Any]):
+        """Drop a new submission that could not be routed, so it is checked afresh next time."""
+        with self._lock:
+            for key, _ in self._own(submission):
+                del self._seen[key]
+    
+    def link(self, original: SeenSubmission, funnel_page_id: str):
+        """Attach the funnel entry created for an original submission."""
+        with self._lock:
+            original.funnel_page_id = funnel_page_id
+    
+    def add_source(self, original: SeenSubmission, submission_id: str) -> List[str]:
+        """Add a merged intake page to an original's sources; returns the full list."""
+        with self._lock:
+            if submission_id not in original.sources:
+                original.sources.append(submission_id)
+            return list(original.sources)
+    
+    def save(self):
+        """Persist the rejected-fingerprint filter, if it changed."""
+        with self._lock:
+            if self._dirty:
+                self.rejects.save(self.path)
+                self._dirty = False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "tracked_keys": len(self._seen), "rejected_fingerprints": len(self.rejects)}
+
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    from .intake_pipeline import IntakePipeline, RateLimiter
+    
+    print("Testing Intake Dedupe...")
+    
+    assert normalize_email(" Jane.Doe+bd@GoogleMail.com ") == "janedoe@gmail.com"
+    assert normalize_email("j.doe+x@Acme.io") == "j.doe@acme.io"
+    assert normalize_email("not-an-email") is None
+    assert normalize_org("Acme, Inc.") == normalize_org("ACME inc") == "acme"
+    assert normalize_org("The LLC") is None
+    assert message_hash("Short") is None
+    assert message_hash("We would like a demo of the  platform for our team") == \
+        message_hash("we would like a demo of the platform for our TEAM ")
+    assert Fingerprint.of({"email": "a@gmail.com", "org_name": None}).keys() == ["email:a@gmail.com"]
+    
+    # Bloom filter: no false negatives, false positives near the target rate, round-trips
+    bloom = BloomFilter(capacity=10_000, error_rate=1e-3)
+    for n in range(10_000):
+        bloom.add(f"key-{n}")
+    assert all(f"key-{n}" in bloom for n in range(10_000))
+    false_positives = sum(f"other-{n}" in bloom for n in range(100_000)) / 100_000
+    assert false_positives < 3e-3, false_positives
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rejects.bloom"
+        bloom.save(path)
+        loaded = BloomFilter.load(path)
+        assert (loaded.size, loaded.hashes, len(loaded)) == (bloom.size, bloom.hashes, len(bloom))
+        assert all(f"key-{n}" in loaded for n in range(0, 10_000, 7))
+        
+        # Rejected fingerprints expire after one to two windows
+        now = [datetime(2026, 1, 1)]
+        expiring = ExpiringBloomFilter(timedelta(days=7), capacity=1_000, error_rate=1e-3, started=now[0])
+        expiring.add("email:spam@mailinator.com")
+        now[0] += timedelta(days=7, hours=1)
+        assert expiring.rotate(now[0]) and "email:spam@mailinator.com" in expiring
+        expiring.save(path)
+        expiring = ExpiringBloomFilter.load(path, timedelta(days=7), 1_000, 1e-3)
+        assert [started for started, _ in expiring.generations] == [datetime(2026, 1, 8), datetime(2026, 1, 1)]
+        assert "email:spam@mailinator.com" in expiring
+        now[0] += timedelta(days=7)
+        assert expiring.rotate(now[0]) and "email:spam@mailinator.com" not in expiring
+        assert not expiring.rotate(now[0]) and len(expiring.generations) == 2
+        now[0] += timedelta(days=30)
+        assert expiring.rotate(now[0]) and len(expiring.generations) == 1
+        assert expiring.generations[0][0] == datetime(2026, 2, 12)
+        bloom.save(path)
+        assert len(ExpiringBloomFilter.load(path, timedelta(days=7), now=now[0])) == len(bloom)
+        
+        # Window expiry and LRU bound
+        now = [datetime(2026, 1, 1)]
+        deduper = IntakeDeduper(path=Path(tmp) / "window.bloom", capacity=4,
+                                window=timedelta(days=7), clock=lambda: now[0])
+        first = {"id": "p1", "email": "a@acme.com", "org_name": "Acme"}
+        assert deduper.check(first) is None
+        match = deduper.check({"id": "p2", "email": "b@acme.com", "org_name": "Acme Inc"})
+        assert match.action == "merge" and match.reason == "same org" and match.original.result is None
+        now[0] += timedelta(days=8)
+        assert deduper.check({"id": "p3", "email": "a@acme.com", "org_name": "Acme"}) is None
+        for n in range(4):
+            deduper.check({"id": f"q{n}", "email": f"q{n}@gmail.com"})
+        assert deduper.get_stats()["tracked_keys"] == 4
+        assert deduper.check({"id": "p4", "email": "a@acme.com", "org_name": "Acme"}) is None
+        
+        # A rejected sender is turned away within the window, then routed again
+        spammer = {"id": "s1", "email": "deals@spam.biz"}
+        assert deduper.check(spammer) is None
+        deduper.resolve(spammer, DedupeMatch("reject", "test", None).result("s1"))
+        deduper.forget(spammer)
+        now[0] += timedelta(days=6)
+        assert deduper.check({"id": "s2", "email": "deals@spam.biz"}).action == "reject"
+        now[0] += timedelta(days=9)
+        assert deduper.check({"id": "s3", "email": "deals@spam.biz"}) is None
+        
+        # Batches through the pipeline, with and without a deduper
+        class FakeNotion:
+            def __init__(self, pages):
+                self.pages = pages
+                self.calls = []
+                self.relations = {}
+            
+            def query_database(self, db_key, filter_obj=None, sorts=None, page_size=100):
+                return self.pages
+            
+            def update_page(self, page_id, properties):
+                self.calls.append("update")
+                if "Source Submission" in properties:
+                    self.relations[page_id] = [r["id"] for r in properties["Source Submission"]["relation"]]
+                return {"id": page_id}
+            
+            def create_page(self, db_key, properties):
+                self.calls.append("create")
+                source = properties["Source Submission"]["relation"][0]["id"]
+                self.relations[f"funnel-{source}"] = [source]
+                return {"id": f"funnel-{source}"}
+        
+        def text(kind, value):
+            if kind == "title":
+                return {"type": "title", "title": [{"plain_text": value}]}
+            if kind == "select":
+                return {"type": "select", "select": {"name": value}}
+            return {"type": "rich_text", "rich_text": [{"plain_text": value}]}
+        
+        rng = random.Random(50)
+        people = [(f"Org {n}", f"person{n}@org{n}.com") for n in range(60)]
+        spam_message = "Claim your crypto airdrop now, guaranteed returns for early investors"
+        
+        def batch(start, size):
+            pages = []
+            for n in range(start, start + size):
+                props = {"Source": text("select", "inbound"), "Intent Signal": text("select", "demo_request")}
+                if rng.random() < 0.2:
+                    # Bot resubmitting the same pitch from rotating throwaway addresses
+                    props["Email"] = {"type": "email", "email": f"bot{rng.randint(0, 5)}@mailinator.com"}
+                    props["Message"] = text("rich_text", spam_message)
+                else:
+                    org, email = rng.choice(people)
+                    props["Organization"] = text("title", org)
+                    props["Email"] = {"type": "email", "email": email}
+                pages.append({"id": f"intake-{n:04d}", "properties": props})
+            return pages
+        
+        def run(router, pages):
+            router.notion = FakeNotion(pages)
+            pipeline = IntakePipeline(router, workers=4, rate_limiter=RateLimiter(rate=10_000, burst=50))
+            return pipeline.run(), router.notion
+        
+        first_batch, second_batch = batch(0, 300), batch(300, 100)
+        baseline, baseline_notion = run(BDRouter(), first_batch)
+        
+        bloom_path = Path(tmp) / "intake_rejects.bloom"
+        router = BDRouter(deduper=IntakeDeduper(path=bloom_path))
+        report, notion = run(router, first_batch)
+        assert not report.failures, report.failures
+        creates = notion.calls.count("create")
+        assert creates == len({p["properties"]["Organization"]["title"][0]["plain_text"]
+                               for p in first_batch if "Organization" in p["properties"]})
+        assert all(i.result is not None for i in report.items)
+        # Every intake page ends up linked to exactly one funnel entry
+        linked = [page for pages in notion.relations.values() for page in pages]
+        assert sorted(linked) == sorted(i.page_id for i in report.items if i.funnel_page_id)
+        assert len(linked) == len(set(linked))
+        for item in report.items:
+            if item.dedupe == "merge":
+                assert item.page_id in notion.relations[item.funnel_page_id]
+        assert bloom_path.exists()
+        print(f"\nBatch of {len(first_batch)}: Notion calls {len(baseline_notion.calls)} → {len(notion.calls)}, "
+              f"funnel entries {baseline_notion.calls.count('create')} → {creates}, "
+              f"routed {len(first_batch)} → {len(first_batch) - report.summary()['duplicates']}")
+        
+        # A restarted router still short-circuits known spam via the persisted filter
+        restarted = BDRouter(deduper=IntakeDeduper(path=bloom_path))
+        report, notion = run(restarted, second_batch)
+        spam = [i for i, p in zip(report.items, second_batch) if "Organization" not in p["properties"]]
+        assert spam and all(i.dedupe == "reject" and i.result.matched_rule == "duplicate_reject" for i in spam)
+        print(f"Restarted: {len(spam)} spam resubmissions rejected unrouted; stats {restarted.deduper.get_stats()}")
+    
+    print("\n✓ Intake dedupe working")
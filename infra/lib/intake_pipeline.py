@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Intake Processing Pipeline for BD Surface.
+Fetches new intake submissions, routes them in one batch and writes the
+Notion updates concurrently under a shared rate limit.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bd_router import BDRouter, RoutingResult
+    from .intake_dedupe import DedupeMatch, SeenSubmission
+
+# Notion allows an average of three requests per second per integration
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+
+class RateLimiter:
+    """
+    Token bucket shared by worker threads.
+    
+    Allows `rate` calls per second on average with bursts of up to `burst`.
+    Callers reserve a slot under the lock and sleep outside it, so waiting
+    threads queue in arrival order without holding the lock.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Wait for a slot; returns the seconds waited."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+@dataclass
+class IntakeItem:
+    """Outcome for one intake page."""
+    page_id: str
+    result: Optional["RoutingResult"] = None
+    funnel_page_id: Optional[str] = None
+    error: Optional[str] = None
+    failed_stage: Optional[str] = None   # extract, dedupe, route, update_page, create_page, merge, write
+    dedupe: Optional[str] = None         # "merge" or "reject" for a duplicate
+    duplicate_of: Optional[str] = None   # its original submission, if still tracked
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class IntakeReport:
+    """Per-item outcomes (in query order) plus stage timings."""
+    items: List[IntakeItem]
+    timings: Dict[str, float] = field(default_factory=dict)   # wall seconds per stage
+    calls: Dict[str, int] = field(default_factory=dict)       # Notion calls by method
+    
+    @property
+    def results(self) -> List["RoutingResult"]:
+        return [item.result for item in self.items if item.result is not None]
+    
+    @property
+    def failures(self) -> List[IntakeItem]:
+        return [item for item in self.items if not item.ok]
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "submissions": len(self.items),
+            "routed": len(self.results),
+            "failed": len(self.failures),
+            "duplicates": sum(item.dedupe is not None for item in self.items),
+            "timings": {k: round(v, 3) for k, v in self.timings.items()},
+            "calls": dict(self.calls),
+        }
+
+
+class _Stats:
+    """Thread-safe accumulators for timings and call counts."""
+    
+    def __init__(self):
+        self.timings: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    def add(self, stage: str, seconds: float, calls: int = 0):
+        with self._lock:
+            self.timings[stage] += seconds
+            if calls:
+                self.calls[stage] += calls
+    
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+
+class IntakePipeline:
+    """
+    Runs BDRouter's intake flow as fetch → extract → dedupe → route → write
+    stages.
+    
+    Fetch and routing are CPU-side and run once for the whole batch
+    (routing via BDRouter.route_many). When the router has a deduper
+    (see intake_dedupe.IntakeDeduper), duplicates are taken out before
+    routing: copies of a rejected submission are rejected, others are
+    merged by linking their intake page to the original's funnel entry
+    (one funnel update per original) instead of creating a new one.
+    
+    Each submission's Notion writes, the intake status update and then the
+    funnel entry, run as one job on a bounded thread pool, so order within
+    a submission is kept while submissions proceed concurrently. Every Notion call takes a slot from
+    a shared RateLimiter and is retried after 429 responses, honouring
+    Retry-After. A failure is recorded on its item and skips only that
+    item's later stages.
+    
+    Timings report wall time for fetch/extract/dedupe/route/write, plus summed
+    per-call time for update_page/create_page/merge and rate_limit_wait (these
+    overlap across workers, so they can exceed the write stage's wall time).
+    """
+    
+    def __init__(
+        self,
+        router: "BDRouter",
+        workers: int = 4,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        sleep=time.sleep,
+    ):
+        self.router = router
+        self.workers = max(1, workers)
+        self.rate_limiter = rate_limiter or RateLimiter(NOTION_REQUESTS_PER_SECOND)
+        self.max_retries = max_retries
+        self.sleep = sleep
+    
+    def _call(self, stats: _Stats, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """One rate-limited Notion call, retried on 429."""
+        for attempt in range(self.max_retries + 1):
+            stats.add("rate_limit_wait", self.rate_limiter.acquire())
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                response = getattr(e, "response", None)
+                if getattr(response, "status_code", None) != 429 or attempt == self.max_retries:
+                    raise
+                retry_after = (response.headers or {}).get("Retry-After")
+            finally:
+                stats.add(name, time.perf_counter() - start, calls=1)
+            self.sleep(float(retry_after) if retry_after else 2.0 ** attempt)
+    
+    def _write(
+        self,
+        stats: _Stats,
+        item: IntakeItem,
+        sub_data: Dict[str, Any],
+        original: Optional["SeenSubmission"] = None,
+        duplicates: List[IntakeItem] = (),
+    ):
+        """
+        Intake status update, then funnel entry, for one routed submission;
+        then merges any `duplicates` of it from the same batch.
+        """
+        router, notion = self.router, self.router.notion
+        stage = "update_page"
+        try:
+            self._call(stats, stage, notion.update_page, item.page_id,
+                       properties=router._intake_properties(item.result))
+            if router._needs_funnel_entry(item.result):
+                stage = "create_page"
+                page = self._call(stats, stage, notion.create_page, router.FUNNEL_TRACKER_DB,
+                                  properties=router._funnel_properties(item.page_id, sub_data, item.result))
+                item.funnel_page_id = page.get("id") if isinstance(page, dict) else None
+        except Exception as e:
+            item.error = f"{type(e).__name__}: {e}"
+            item.failed_stage = stage
+        if original is not None and item.funnel_page_id:
+            router.deduper.link(original, item.funnel_page_id)
+        if duplicates:
+            self._merge(stats, original, duplicates)
+    
+    def _merge(self, stats: _Stats, original: "SeenSubmission", duplicates: List[IntakeItem]):
+        """
+        Link duplicates' intake pages to the original's funnel entry (one
+        update for all of them), then mark each intake page. The intake
+        pages stay New if the funnel update fails, so they are retried.
+        """
+        router, notion = self.router, self.router.notion
+        funnel_page_id = original.funnel_page_id
+        if funnel_page_id is None and router._needs_funnel_entry(original.result):
+            for item in duplicates:
+                item.error = f"original submission {original.submission_id} has no funnel entry"
+                item.failed_stage = "merge"
+            return
+        if funnel_page_id is not None:
+            sources = original.sources + [i.page_id for i in duplicates if i.page_id not in original.sources]
+            try:
+                self._call(stats, "merge", notion.update_page, funnel_page_id,
+                           properties=router._funnel_sources_properties(sources))
+            except Exception as e:
+                for item in duplicates:
+                    item.error = f"{type(e).__name__}: {e}"
+                    item.failed_stage = "merge"
+                return
+            for item in duplicates:
+                router.deduper.add_source(original, item.page_id)
+                item.funnel_page_id = funnel_page_id
+        for item in duplicates:
+            try:
+                self._call(stats, "update_page", notion.update_page, item.page_id,
+                           properties=router._intake_properties(item.result))
+            except Exception as e:
+                item.error = f"{type(e).__name__}: {e}"
+                item.failed_stage = "update_page"
+    
+    def run(self, pages: Optional[List[Dict[str, Any]]] = None) -> IntakeReport:
+        """
+        Process new intake submissions (or the given intake `pages`).
+        
+        Returns:
+            IntakeReport with one item per page, in query order
+        """
+        router = self.router
+        stats = _Stats()
+        
+        with stats.timed("fetch"):
+            if pages is None:
+                pages = self._call(stats, "query_database", router.notion.query_database,
+                                   router.INTAKE_SUBMISSIONS_DB,
+                                   filter_obj=router.intake_filter())
+        
+        items = [IntakeItem(page_id=page.get("id", "unknown")) for page in pages]
+        routable: List[int] = []
+        submissions: List[Dict[str, Any]] = []
+        with stats.timed("extract"):
+            for i, page in enumerate(pages):
+                try:
+                    submissions.append(router._extract_submission_data(page))
+                    routable.append(i)
+                except Exception as e:
+                    items[i].error = f"{type(e).__name__}: {e}"
+                    items[i].failed_stage = "extract"
+        
+        deduper = router.deduper
+        matches: Dict[int, "DedupeMatch"] = {}
+        to_route = list(zip(routable, submissions))
+        if deduper is not None:
+            with stats.timed("dedupe"):
+                unique = []
+                for i, sub_data in to_route:
+                    try:
+                        match = deduper.check(sub_data)
+                    except Exception as e:
+                        items[i].error = f"{type(e).__name__}: {e}"
+                        items[i].failed_stage = "dedupe"
+                        continue
+                    if match is None:
+                        unique.append((i, sub_data))
+                    else:
+                        matches[i] = match
+                to_route = unique
+        
+        with stats.timed("route"):
+            try:
+                results = router.route_many([s for _, s in to_route])
+            except Exception:
+                # Fall back to routing one by one so a bad item only fails itself
+                results = []
+                for i, sub_data in to_route:
+                    try:
+                        results.append(router.route(sub_data))
+                    except Exception as e:
+                        results.append(None)
+                        items[i].error = f"{type(e).__name__}: {e}"
+                        items[i].failed_stage = "route"
+        
+        originals: Dict[int, "SeenSubmission"] = {}
+        duplicates: Dict[str, List[IntakeItem]] = defaultdict(list)
+        merge_targets: Dict[str, "SeenSubmission"] = {}
+        if deduper is not None:
+            with stats.timed("dedupe"):
+                for (i, sub_data), result in zip(to_route, results):
+                    if result is None:
+                        deduper.forget(sub_data)
+                    else:
+                        originals[i] = deduper.resolve(sub_data, result)
+                for i, match in matches.items():
+                    original = match.original
+                    items[i].duplicate_of = original.submission_id if original else None
+                    if original is not None and original.result is None:
+                        items[i].error = f"original submission {original.submission_id} was not routed"
+                        items[i].failed_stage = "dedupe"
+                        continue
+                    if match.action == "merge" and original.rejected:
+                        match.action = "reject"
+                    items[i].dedupe = match.action
+                    items[i].result = match.result(items[i].page_id)
+                    if match.action == "merge":
+                        merge_targets[original.submission_id] = original
+                        duplicates[original.submission_id].append(items[i])
+        
+        # Each write task with the items it covers, so an unexpected error fails them
+        tasks: List[Tuple[Future, List[IntakeItem]]] = []
+        with stats.timed("write"):
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for (i, sub_data), result in zip(to_route, results):
+                    if result is None:
+                        continue
+                    items[i].result = result
+                    original = originals.get(i)
+                    merged = duplicates.pop(original.submission_id, []) if original else []
+                    tasks.append((pool.submit(self._write, stats, items[i], sub_data, original, merged),
+                                  [items[i]] + merged))
+                for i, match in matches.items():
+                    if match.action == "reject" and items[i].result is not None:
+                        tasks.append((pool.submit(self._write, stats, items[i], {}), [items[i]]))
+                # Duplicates of originals from earlier batches
+                for submission_id, merged in duplicates.items():
+                    tasks.append((pool.submit(self._merge, stats, merge_targets[submission_id], merged), merged))
+        for future, covered in tasks:
+            e = future.exception()
+            if e is None:
+                continue
+            for item in covered:
+                if item.ok:
+                    item.error = f"{type(e).__name__}: {e}"
+                    item.failed_stage = "write"
+        
+        if deduper is not None:
+            deduper.save()
+        
+        return IntakeReport(items=items, timings=dict(stats.timings), calls=dict(stats.calls))
+
+
+if __name__ == "__main__":
+    import random
+    from .bd_router import BDRouter, RouteDecision
+    
+    print("Testing Intake Pipeline...")
+    
+    # Token bucket spacing, on a fake clock
+    now = [0.0]
+    waits = []
+    limiter = RateLimiter(rate=4, burst=2, clock=lambda: now[0], sleep=waits.append)
+    assert [limiter.acquire() for _ in range(4)] == [0.0, 0.0, 0.25, 0.5]
+    now[0] = 10.0
+    assert limiter.acquire() == 0.0
+    
+    class RateLimited(Exception):
+        def __init__(self):
+            super().__init__("429 Too Many Requests")
+            self.response = type("Response", (), {"status_code": 429, "headers": {"Retry-After": "0"}})()
+    
+    class FakeNotion:
+        """In-memory Notion with latency, throttling and a few broken pages."""
+        
+        def __init__(self, pages, latency=0.01):
+            self.pages = pages
+            self.latency = latency
+            self.calls = []
+            self.rng = random.Random(49)
+            self._lock = threading.Lock()
+        
+        def _record(self, *call):
+            time.sleep(self.latency)
+            with self._lock:
+                self.calls.append(call)
+                throttled = self.rng.random() < 0.05
+            if throttled:
+                raise RateLimited()
+        
+        def query_database(self, db_key, filter_obj=None, sorts=None, page_size=100):
+            assert filter_obj["select"]["equals"] == "New"
+            time.sleep(self.latency)
+            return self.pages
+        
+        def update_page(self, page_id, properties):
+            self._record("update", page_id)
+            if page_id.endswith("13"):
+                raise RuntimeError("page archived")
+            return {"id": page_id}
+        
+        def create_page(self, db_key, properties):
+            source = properties["Source Submission"]["relation"][0]["id"]
+            self._record("create", source)
+            return {"id": f"funnel-{source}"}
+    
+    def text(kind, value):
+        if kind == "title":
+            return {"type": "title", "title": [{"plain_text": value}]}
+        if kind == "select":
+            return {"type": "select", "select": {"name": value}}
+        return {"type": "rich_text", "rich_text": [{"plain_text": value}]}
+    
+    rng = random.Random(7)
+    pages = []
+    for i in range(300):
+        props = {
+            "Organization": text("title", rng.choice(["Acme Corp", "Globex", "Initech"])),
+            "Source": text("select", rng.choice(["inbound", "referral", "research_identified"])),
+            "Intent Signal": text("select", rng.choice(["demo_request", "partnership"])),
+            "Email": {"type": "email", "email": f"person{i}@example.com"},
+        }
+        pages.append({"id": f"intake-{i:04d}", "properties": props})
+    pages[42] = {"properties": {}}      # no id: fails extraction
+    
+    timings = {}
+    for workers in (1, 8):
+        notion = FakeNotion(pages)
+        router = BDRouter(notion_client=notion)
+        pipeline = IntakePipeline(router, workers=workers, rate_limiter=RateLimiter(rate=10_000, burst=50))
+        start = time.perf_counter()
+        report = pipeline.run()
+        timings[workers] = time.perf_counter() - start
+        
+        assert len(report.items) == len(pages)
+        assert [i.page_id for i in report.items][:3] == ["intake-0000", "intake-0001", "intake-0002"]
+        failed = {i.page_id: i.failed_stage for i in report.failures}
+        assert failed == {"unknown": "extract", "intake-0013": "update_page", "intake-0113": "update_page",
+                          "intake-0213": "update_page"}, failed
+        
+        # Per submission: update (with any retries) strictly before create
+        first_create = {}
+        last_update = {}
+        for n, (kind, page_id) in enumerate(notion.calls):
+            if kind == "update":
+                last_update[page_id] = n
+            else:
+                first_create.setdefault(page_id, n)
+        assert all(last_update[p] < n for p, n in first_create.items())
+        expected = [i for i in report.items if i.ok and i.result.decision != RouteDecision.REJECT]
+        assert all(i.funnel_page_id == f"funnel-{i.page_id}" for i in expected)
+        assert "intake-0013" not in first_create
+    
+    # Errors outside the Notion calls (here linking the deduper entry) still fail their items
+    import tempfile
+    from .intake_dedupe import IntakeDeduper
+    
+    class BrokenLink(IntakeDeduper):
+        def link(self, original, funnel_page_id):
+            raise RuntimeError("deduper unavailable")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        broken = BDRouter(notion_client=FakeNotion(pages, latency=0), deduper=BrokenLink(path=f"{tmp}/rejects.bloom"))
+        broken_report = IntakePipeline(broken, workers=4, rate_limiter=RateLimiter(rate=10_000, burst=50)).run()
+    linked = [i for i in broken_report.items if i.funnel_page_id and i.dedupe is None]
+    assert linked and all(i.failed_stage == "write" and "deduper unavailable" in i.error for i in linked)
+    assert all(i.funnel_page_id is None or not i.ok for i in broken_report.items)
+    
+    results = router.process_new_submissions(workers=8, rate_limiter=RateLimiter(rate=10_000, burst=50))
+    assert len(results) == len(router.last_report.results) == 299
+    
+    print(f"\n{len(pages)} submissions, 10 ms per Notion call:")
+    print(f"  1 worker:  {timings[1]:.2f} s")
+    print(f"  8 workers: {timings[8]:.2f} s")
+    print(f"Report: {report.summary()}")
+    
+    print("\n✓ Intake pipeline working")
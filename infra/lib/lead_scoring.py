@@ -5,11 +5,16 @@ Calculates engagement scores for contacts and organizations.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterable, List, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
+import heapq
 import json
 
+if TYPE_CHECKING:
+    from .score_repository import ScoreRepository
+    from .signal_store import SignalStore
+
 
 class SignalType(Enum):
     """Types of engagement signals."""
@@ -98,8 +103,43 @@ class LeadScorer:
     Uses time-decay to weight recent activity higher.
     """
     
-    def __init__(self, weights: Optional[ScoringWeights] = None):
+    def __init__(
+        self,
+        weights: Optional[ScoringWeights] = None,
+        repository: Optional["ScoreRepository"] = None,
+    ):
         self.weights = weights or ScoringWeights()
+        self.repository = repository
+    
+    def record_signal(
+        self,
+        contact_id: str,
+        signal: EngagementSignal,
+        org_id: Optional[str] = None,
+    ):
+        """Store a signal in the repository; the contact's cached score is dropped."""
+        if self.repository is None:
+            raise ValueError("LeadScorer has no score repository")
+        self.repository.add_signal(contact_id, signal, org_id)
+    
+    def get_score(self, contact_id: str) -> Optional[LeadScore]:
+        """
+        Current score for a contact from the repository (see
+        score_repository.ScoreRepository). Returns None without a repository
+        or when the contact has no recorded signals.
+        """
+        if self.repository is None:
+            return None
+        return self.repository.get(contact_id, self)
+    
+    def get_scores(self, contact_ids: Iterable[str]) -> Dict[str, Optional[LeadScore]]:
+        """
+        get_score for many contacts in one repository round trip. Returns an
+        empty dict without a repository.
+        """
+        if self.repository is None:
+            return {}
+        return self.repository.get_many(contact_ids, self)
     
     def _decay_factor(self, age_days: float) -> float:
         """Calculate decay factor based on age."""
@@ -194,6 +234,11 @@ class LeadScorer:
             top_signals=top_signals,
         )
     
+    @staticmethod
+    def _org_weight(tier: str) -> int:
+        """Weight of a contact in its org's average, by tier."""
+        return 3 if tier == "hot" else 2 if tier == "warm" else 1
+    
     def calculate_org_score(
         self,
         org_id: str,
@@ -219,7 +264,7 @@ class LeadScorer:
         total_weight = 0
         weighted_sum = 0
         for score in contact_scores:
-            weight = 3 if score.tier == "hot" else 2 if score.tier == "warm" else 1
+            weight = self._org_weight(score.tier)
             weighted_sum += score.decayed_score * weight
             total_weight += weight
         
@@ -237,13 +282,46 @@ class LeadScorer:
     def batch_score(
         self,
         leads: Dict[str, List[EngagementSignal]],
+        reference_time: Optional[datetime] = None,
+        vectorized: bool = False,
     ) -> List[LeadScore]:
-        """Score multiple leads at once."""
+        """
+        Score multiple leads at once.
+        
+        With vectorized=True the batch is scored with numpy array operations
+        (see vector_scoring.VectorScorer); results match within float tolerance.
+        """
+        if vectorized:
+            from .vector_scoring import SignalArrays, VectorScorer
+            arrays = SignalArrays.from_leads(leads)
+            return VectorScorer(self.weights).score(arrays, reference_time).to_lead_scores()
+        
         return [
-            self.calculate(contact_id, signals)
+            self.calculate(contact_id, signals, reference_time=reference_time)
             for contact_id, signals in leads.items()
         ]
     
+    def score_store(
+        self,
+        store: "SignalStore",
+        reference_time: Optional[datetime] = None,
+        workers: int = 1,
+    ) -> List[LeadScore]:
+        """
+        Score every contact in a signal_store.SignalStore straight from its
+        columns, without building EngagementSignal objects.
+        
+        With workers > 1 contacts are sharded by hash across a process pool
+        (see parallel_scoring.score_sharded).
+        """
+        if workers > 1:
+            from .parallel_scoring import score_sharded
+            return score_sharded(store, workers, reference_time, self.weights).to_lead_scores()
+        
+        from .vector_scoring import VectorScorer
+        arrays = store.to_signal_arrays()
+        return VectorScorer(self.weights).score(arrays, reference_time).to_lead_scores()
+    
     def prioritize(
         self,
         scores: List[LeadScore],
@@ -265,10 +343,13 @@ class LeadScorer:
         if tier_filter:
             filtered = [s for s in scores if s.tier == tier_filter]
         
-        # Sort by score descending, then recency
-        filtered.sort(key=lambda x: (x.decayed_score, x.last_activity or datetime.min), reverse=True)
-        
-        return filtered[:limit]
+        # Score descending, then recency; leaves the caller's list untouched.
+        # For a live queue over many contacts see lead_index.LeadRankIndex.
+        return heapq.nlargest(
+            limit,
+            filtered,
+            key=lambda x: (x.decayed_score, x.last_activity or datetime.min),
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Declarative Routing Rules for BD Surface.
+Compiles JSON (or YAML) routing rulesets into an indexed evaluation plan.
+"""
+
+import json
+import operator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Callable, Union
+
+# Optional YAML rulesets
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+DEFAULT_RULES_FILE = Path(__file__).resolve().parents[2] / "config" / "bd-routing-rules.json"
+DEFAULT_INDEX_FIELDS = ("source", "intent_signal")
+
+# Distinct (source, intent_signal, ...) keys whose candidate lists are kept
+MAX_CACHED_KEYS = 4096
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# Builds the router's rule object from a spec and its standalone condition
+RuleBuilder = Callable[["RuleSpec", Callable[[Dict[str, Any]], bool]], Any]
+
+
+@dataclass
+class RuleSpec:
+    """
+    One declarative routing rule.
+    
+    `when` maps a submission field, or "@name" for a registered function of
+    the submission, to a condition; all must hold (empty = catch-all):
+    
+        value            equal
+        [a, b]           any of
+        "*"              present and non-empty
+        true / false     truthy / falsy (false also matches a missing field)
+        {">=": x, ...}   comparisons (==, !=, >, >=, <, <=, in, not_in);
+                         false for a missing value
+    """
+    name: str
+    when: Dict[str, Any]
+    decision: str
+    priority: int = 0
+    stage: Optional[str] = None
+    team: Optional[str] = None
+    description: str = ""
+
+
+def load_ruleset(path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """Read a ruleset file (default: config/bd-routing-rules.json); .yaml/.yml need PyYAML."""
+    path = Path(path or DEFAULT_RULES_FILE)
+    with open(path) as f:
+        if path.suffix in (".yaml", ".yml"):
+            if not YAML_AVAILABLE:
+                raise ImportError("YAML routing rules require PyYAML")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _compile_condition(condition: Any) -> Callable[[Any], bool]:
+    """Test function for one condition value (see RuleSpec)."""
+    if condition == "*":
+        return lambda v: v not in (None, "", [], {})
+    if isinstance(condition, bool):
+        return bool if condition else operator.not_
+    if isinstance(condition, list):
+        options = list(condition)
+        return lambda v: v in options
+    if isinstance(condition, dict):
+        tests = []
+        for op, operand in condition.items():
+            if op == "in":
+                tests.append(lambda v, options=list(operand): v in options)
+            elif op == "not_in":
+                tests.append(lambda v, options=list(operand): v not in options)
+            elif op in COMPARISONS:
+                tests.append(lambda v, fn=COMPARISONS[op], x=operand: fn(v, x))
+            else:
+                raise ValueError(f"Unknown condition operator: {op}")
+        return lambda v: v is not None and all(test(v) for test in tests)
+    return lambda v: v == condition
+
+
+def _indexable(condition: Any) -> bool:
+    """Equality / any-of conditions on plain values can be answered by a dict lookup."""
+    values = condition if isinstance(condition, list) else [condition]
+    return all(
+        v is None or (isinstance(v, (str, int, float)) and not isinstance(v, bool) and v != "*")
+        for v in values
+    )
+
+
+@dataclass
+class _CompiledRule:
+    rule: Any
+    tests: Tuple[int, ...]   # predicate ids not already implied by the index
+
+
+class RoutingPlan:
+    """
+    First-match-by-priority evaluation of a compiled ruleset.
+    
+    Equality and any-of conditions on the index fields (default `source`
+    and `intent_signal`) are moved into per-field value → rules maps, so a
+    submission only visits rules that can match its values (plus rules
+    that do not constrain that field). Candidate lists are cached per
+    distinct key. Remaining conditions are deduplicated into shared
+    predicates, each evaluated at most once per submission; "@name"
+    function values are likewise computed once and shared between
+    predicates. Rules keep their priority order (ties in file order).
+    """
+    
+    def __init__(
+        self,
+        specs: List[RuleSpec],
+        functions: Dict[str, Callable[[Dict[str, Any]], Any]],
+        build: RuleBuilder,
+        index_fields: Tuple[str, ...] = DEFAULT_INDEX_FIELDS,
+    ):
+        self.index_fields = tuple(index_fields)
+        self.functions = functions
+        self._predicates: List[Tuple[str, Callable[[Any], bool]]] = []
+        self._by_value: Dict[str, Dict[Any, List[int]]] = {f: {} for f in self.index_fields}
+        self._unconstrained: Dict[str, set] = {f: set() for f in self.index_fields}
+        self._cache: Dict[Tuple[Any, ...], List[int]] = {}
+        self._compiled: List[_CompiledRule] = []
+        
+        predicate_ids: Dict[Tuple[str, str], int] = {}
+        for position, spec in enumerate(sorted(specs, key=lambda s: -s.priority)):
+            tests, indexed, standalone = [], set(), []
+            for key, condition in spec.when.items():
+                if key.startswith("@") and key[1:] not in functions:
+                    raise ValueError(f"Rule {spec.name}: unknown function {key}")
+                test = _compile_condition(condition)
+                standalone.append((key, test))
+                if key in self._by_value and _indexable(condition):
+                    values = condition if isinstance(condition, list) else [condition]
+                    for value in values:
+                        self._by_value[key].setdefault(value, []).append(position)
+                    indexed.add(key)
+                    continue
+                signature = (key, json.dumps(condition, sort_keys=True))
+                if signature not in predicate_ids:
+                    predicate_ids[signature] = len(self._predicates)
+                    self._predicates.append((key, test))
+                tests.append(predicate_ids[signature])
+            for f in self.index_fields:
+                if f not in indexed:
+                    self._unconstrained[f].add(position)
+            rule = build(spec, self._standalone_condition(standalone))
+            self._compiled.append(_CompiledRule(rule, tuple(tests)))
+        self._all = list(range(len(self._compiled)))
+    
+    def __len__(self) -> int:
+        return len(self._compiled)
+    
+    @property
+    def rules(self) -> List[Any]:
+        """Built rules in evaluation (priority) order."""
+        return [c.rule for c in self._compiled]
+    
+    @property
+    def predicate_count(self) -> int:
+        return len(self._predicates)
+    
+    def _value(self, key: str, submission: Dict[str, Any], values: Dict[str, Any]) -> Any:
+        if not key.startswith("@"):
+            return submission.get(key)
+        if key not in values:
+            values[key] = self.functions[key[1:]](submission)
+        return values[key]
+    
+    def _standalone_condition(self, tests: List[Tuple[str, Callable[[Any], bool]]]) -> Callable[[Dict[str, Any]], bool]:
+        """Unindexed, unshared condition, for callers holding a single rule."""
+        return lambda s: all(test(self._value(key, s, {})) for key, test in tests)
+    
+    def _allowed(self, key: Tuple[Any, ...]) -> List[int]:
+        allowed = set(self._all)
+        for f, value in zip(self.index_fields, key):
+            try:
+                matching = self._by_value[f].get(value, ())
+            except TypeError:
+                matching = ()   # a list or dict never equals an indexed scalar
+            allowed &= self._unconstrained[f].union(matching)
+        return sorted(allowed)
+    
+    def candidates(self, submission: Dict[str, Any]) -> List[int]:
+        """Positions of rules that can match `submission`'s index field values."""
+        key = tuple(submission.get(f) for f in self.index_fields)
+        try:
+            cached = self._cache.get(key)
+        except TypeError:
+            return self._allowed(key)   # unhashable field value: not cached
+        if cached is not None:
+            return cached
+        cached = self._allowed(key)
+        if len(self._cache) < MAX_CACHED_KEYS:
+            self._cache[key] = cached
+        return cached
+    
+    def match(self, submission: Dict[str, Any]) -> Tuple[Optional[Any], List[Dict[str, Any]]]:
+        """
+        First matching rule for `submission` and any rule errors on the way.
+        A rule whose predicate raises is recorded and skipped.
+        """
+        values: Dict[str, Any] = {}
+        results: Dict[int, bool] = {}
+        errors = []
+        for position in self.candidates(submission):
+            compiled = self._compiled[position]
+            try:
+                for pid in compiled.tests:
+                    if pid not in results:
+                        key, test = self._predicates[pid]
+                        results[pid] = bool(test(self._value(key, submission, values)))
+                    if not results[pid]:
+                        break
+                else:
+                    return compiled.rule, errors
+            except Exception as e:
+                errors.append({"type": "rule_error", "rule": compiled.rule.name, "error": str(e)})
+        return None, errors
+
+
+def compile_ruleset(
+    ruleset: Dict[str, Any],
+    functions: Dict[str, Callable[[Dict[str, Any]], Any]],
+    build: RuleBuilder,
+) -> RoutingPlan:
+    """
+    Compile a loaded ruleset ({"index": [...], "rules": [...]}) into a plan.
+    
+    Args:
+        ruleset: Parsed ruleset (see load_ruleset)
+        functions: Values available to conditions as "@name"
+        build: Turns (RuleSpec, condition) into the caller's rule object
+    """
+    specs = [RuleSpec(**rule) for rule in ruleset["rules"]]
+    names = [s.name for s in specs]
+    if len(set(names)) != len(names):
+        raise ValueError("Routing rule names must be unique")
+    return RoutingPlan(
+        specs,
+        functions,
+        build,
+        index_fields=tuple(ruleset.get("index", DEFAULT_INDEX_FIELDS)),
+    )
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+    from .bd_router import BDRouter
+    
+    print("Testing Routing Rules...")
+    
+    router = BDRouter()
+    plan = router.plan
+    print(f"\n{len(plan)} rules, {plan.predicate_count} shared predicates, index on {plan.index_fields}")
+    
+    # Indexed, memoized plan agrees with a linear scan of standalone conditions
+    rng = random.Random(46)
+    sources = ["inbound", "referral", "research_identified", "event", None]
+    intents = ["demo_request", "pricing_inquiry", "partnership", "newsletter", "", None]
+    submissions = [
+        {
+            "id": f"sub-{i}",
+            "org_name": rng.choice(["Acme Corp", "Globex", None]),
+            "email": rng.choice(["ceo@acme.com", "x@mailinator.com", "a@test.com"]),
+            "message": rng.choice(["Pricing please", "crypto airdrop now", ""]),
+            "source": rng.choice(sources),
+            "intent_signal": rng.choice(intents),
+            "estimated_deal_size": rng.choice([None, 50_000, 2_000_000]),
+            "org_employee_count": rng.choice([0, 50, 5000]),
+            "existing_contact": rng.random() < 0.1,
+        }
+        for i in range(20_000)
+    ]
+    for s in submissions:
+        if s["estimated_deal_size"] is None:
+            del s["estimated_deal_size"]
+    
+    def linear(submission):
+        return next(r for r in plan.rules if r.condition(submission))
+    
+    start = time.perf_counter()
+    for s in submissions:
+        linear(s)
+    linear_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    matched = [plan.match(s)[0] for s in submissions]
+    plan_time = time.perf_counter() - start
+    
+    assert [r.name for r in matched] == [linear(s).name for s in submissions]
+    assert router.route(submissions[0]).matched_rule == matched[0].name
+    print(f"{len(submissions)} submissions: linear {linear_time * 1000:.0f} ms, plan {plan_time * 1000:.0f} ms")
+    
+    # Unhashable index values only reach rules that do not constrain that field
+    odd = {"id": "odd", "org_name": "Acme", "source": ["outbound"], "intent_signal": "demo_request",
+           "estimated_deal_size": 5_000_000}
+    assert plan.match(odd)[0].name == linear(odd).name == "escalate_unclear"
+    odd["intent_signal"] = {"kind": "demo_request"}
+    assert plan.match(odd)[0].name == linear(odd).name
+    
+    # Predicate errors are recorded and the next rule is tried
+    bad = {"id": "bad", "org_name": "Acme", "source": "inbound", "estimated_deal_size": "lots"}
+    result = router.route(bad)
+    assert result.matched_rule == "low_signal_inbound"
+    assert any(s["type"] == "rule_error" for s in result.signals)
+    
+    # Reload picks up an edited ruleset without a new router
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rules.json")
+        ruleset = load_ruleset()
+        with open(path, "w") as f:
+            json.dump(ruleset, f)
+        router = BDRouter(rules_file=path)
+        event = {"id": "e1", "org_name": "Acme", "source": "event"}
+        assert router.route(event).matched_rule == "escalate_unclear"
+        
+        ruleset["rules"].append({
+            "name": "event_lead", "priority": 50, "when": {"source": "event"},
+            "decision": "nurture", "stage": "CONTACT", "team": "outreach",
+        })
+        with open(path, "w") as f:
+            json.dump(ruleset, f)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        assert router.reload_rules()
+        assert not router.reload_rules()
+        assert router.route(event).matched_rule == "event_lead"
+    
+    print("\n✓ Routing rules working")
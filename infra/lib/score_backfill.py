@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Historical Lead Score Backfill for BD Surface.
+Computes every contact's score and tier on a grid of reference times in one
+pass over sorted signals (requires numpy).
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, List, Sequence
+from dataclasses import dataclass
+
+from .lead_scoring import ScoringWeights
+from .vector_scoring import (
+    NUMPY_AVAILABLE,
+    TIERS,
+    SignalArrays,
+    VectorScorer,
+    to_epoch,
+    _require_numpy,
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+BACKFILL_DTYPE = [("contact", "<i4"), ("time", "<u2"), ("score", "<f4"), ("tier", "u1")]
+
+
+def daily_reference_times(end: datetime, days: int = 365) -> List[datetime]:
+    """`days` reference times one day apart, ending at `end`, oldest first."""
+    return [end - timedelta(days=i) for i in range(days - 1, -1, -1)]
+
+
+@dataclass
+class BackfillResult:
+    """Score and tier per (contact, reference time)."""
+    contact_ids: List[str]
+    reference_times: List[datetime]
+    scores: "np.ndarray"    # (contacts, times) float32
+    tiers: "np.ndarray"     # (contacts, times) uint8, index into TIERS
+    
+    def tier_names(self, contact: int) -> List[str]:
+        return [TIERS[t] for t in self.tiers[contact]]
+    
+    def to_records(self) -> "np.ndarray":
+        """Long table of (contact, time, score, tier), 11 bytes per row."""
+        n, t = self.scores.shape
+        records = np.empty(n * t, dtype=BACKFILL_DTYPE)
+        records["contact"] = np.repeat(np.arange(n, dtype=np.int32), t)
+        records["time"] = np.tile(np.arange(t, dtype=np.uint16), n)
+        records["score"] = self.scores.ravel()
+        records["tier"] = self.tiers.ravel()
+        return records
+
+
+def backfill_scores(
+    signals: SignalArrays,
+    reference_times: Sequence[datetime],
+    weights: Optional[ScoringWeights] = None,
+    as_of: bool = True,
+    chunk_size: int = 4096,
+) -> BackfillResult:
+    """
+    Score every contact at every reference time.
+    
+    Decay is separable: Σ w·2^(-(t - ts)/h) = 2^(-t/h) · Σ w·2^(ts/h), so
+    after sorting signals by (contact, timestamp) one cumulative sum of
+    w·2^(ts/h) gives any contact's decayed total at any t from a single
+    searchsorted. The recency boost is the same prefix sum over the sliding
+    window [t - recency_boost_days, t].
+    
+    With as_of=True (default) only signals at or before t count, i.e. the
+    score as it stood on that day. With as_of=False later signals are
+    included at full boosted weight, exactly as calculate(reference_time=t)
+    treats them. Window edges are resolved to the second.
+    
+    Args:
+        signals: SignalArrays (e.g. SignalStore.to_signal_arrays())
+        reference_times: Times to score at, ascending
+        weights: Scoring weights (default: ScoringWeights())
+        as_of: Exclude signals after each reference time
+        chunk_size: Contacts per searchsorted batch (bounds memory)
+    """
+    _require_numpy()
+    weights = weights or ScoringWeights()
+    scorer = VectorScorer(weights)
+    n = len(signals.contact_ids)
+    times = np.array([to_epoch(t) for t in reference_times], dtype=np.float64)
+    if np.any(np.diff(times) < 0):
+        raise ValueError("reference_times must be ascending")
+    
+    half_life = weights.decay_half_life_days * 86400.0
+    window = weights.recency_boost_days * 86400.0
+    multiplier = weights.recency_boost_multiplier
+    origin = times[0] if len(times) else 0.0
+    
+    # Sort by (contact, timestamp) and encode both in one int64 key per row
+    order = np.lexsort((signals.timestamp, signals.contact_index))
+    contact = signals.contact_index[order].astype(np.int64)
+    stamp = signals.timestamp[order]
+    weight = scorer.weight_table[signals.signal_type[order]]
+    
+    seconds = np.floor(stamp).astype(np.int64)
+    base = int(seconds.min()) if len(seconds) else 0
+    span = int(seconds.max() - base) + 2 if len(seconds) else 2
+    keys = contact * span + (seconds - base + 1)
+    
+    def offsets(at: "np.ndarray") -> "np.ndarray":
+        return np.clip(np.floor(at).astype(np.int64) - base + 1, 0, span - 1)
+    
+    upper = offsets(times)              # ts <= t
+    lower = offsets(times - window)     # ts >= t - window
+    
+    value = weight * np.exp2((stamp - origin) / half_life)
+    decay = np.exp2(-(times - origin) / half_life)
+    
+    scores = np.empty((n, len(times)), dtype=np.float32)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        # Prefix sums restart per chunk so differences stay well-conditioned
+        a, b = np.searchsorted(keys, [start * span, stop * span])
+        chunk_keys = keys[a:b]
+        growth = np.zeros(b - a + 1)
+        np.cumsum(value[a:b], out=growth[1:])
+        
+        rows = np.arange(start, stop, dtype=np.int64)[:, None] * span
+        first = np.searchsorted(chunk_keys, rows, "left")
+        hi = np.searchsorted(chunk_keys, rows + upper, "right")
+        lo = np.searchsorted(chunk_keys, rows + lower, "left")
+        
+        prefix = growth[hi] - growth[first]
+        boosted = growth[hi] - growth[np.maximum(lo, first)]
+        chunk = decay * (prefix + (multiplier - 1) * boosted)
+        if not as_of:
+            total_weight = np.zeros(b - a + 1)
+            np.cumsum(weight[a:b], out=total_weight[1:])
+            last = np.searchsorted(chunk_keys, rows + span, "left")
+            chunk += multiplier * (total_weight[last] - total_weight[hi])
+        scores[start:stop] = chunk
+    
+    return BackfillResult(
+        contact_ids=signals.contact_ids,
+        reference_times=list(reference_times),
+        scores=scores,
+        tiers=scorer.tiers(scores),
+    )
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from .lead_scoring import LeadScorer, EngagementSignal
+    from .vector_scoring import SIGNAL_TYPES
+    
+    print("Testing Score Backfill...")
+    
+    rng = random.Random(41)
+    end = datetime(2026, 3, 1)
+    leads = {
+        f"contact-{i:04d}": [
+            EngagementSignal(rng.choice(SIGNAL_TYPES), end - timedelta(seconds=rng.randint(-5 * 86400, 400 * 86400)))
+            for _ in range(rng.randint(0, 40))
+        ]
+        for i in range(400)
+    }
+    grid = daily_reference_times(end, days=365)
+    arrays = SignalArrays.from_leads(leads)
+    
+    start = time.perf_counter()
+    as_of = backfill_scores(arrays, grid)
+    full = backfill_scores(arrays, grid, as_of=False)
+    elapsed = time.perf_counter() - start
+    
+    scorer = LeadScorer()
+    for c, (contact_id, signals) in enumerate(leads.items()):
+        for d in rng.sample(range(len(grid)), 12):
+            t = grid[d]
+            known = [s for s in signals if s.timestamp <= t]
+            for result, subset in ((as_of, known), (full, signals)):
+                expected = scorer.calculate(contact_id, subset, reference_time=t)
+                got = float(result.scores[c, d])
+                assert abs(expected.decayed_score - got) <= 1e-5 * max(1.0, expected.decayed_score), \
+                    (contact_id, t, expected.decayed_score, got)
+                assert expected.tier == TIERS[result.tiers[c, d]] or \
+                    min(abs(expected.decayed_score - x) for x in (10, 40, 80)) < 1e-3
+    
+    records = as_of.to_records()
+    print(f"\n{len(leads)} contacts x {len(grid)} days in {elapsed * 1000:.0f} ms (both modes)")
+    print(f"Table: {len(records):,} rows, {records.nbytes / 2**20:.1f} MiB")
+    
+    print("\n✓ Score backfill working")
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Lead Score Repository for BD Surface.
+Persists engagement signals and computed scores in SQLite and serves scores
+from an in-process LRU cache with TTL, so routing lookups do not rescore
+from raw signals.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, List, Tuple, TYPE_CHECKING
+
+from .lead_scoring import EngagementSignal, LeadScore, ScoringWeights, SignalType
+
+if TYPE_CHECKING:
+    from .lead_scoring import LeadScorer
+
+
+def weights_key(weights: ScoringWeights) -> str:
+    """Short stable hash of a scorer's weights; scores are stored per key."""
+    return _weights_key(tuple(vars(weights).values()))
+
+
+@lru_cache(maxsize=64)
+def _weights_key(values: tuple) -> str:
+    return hashlib.blake2b(repr(values).encode(), digest_size=8).hexdigest()
+
+
+def _dump_score(score: LeadScore) -> str:
+    return json.dumps({
+        "org_id": score.org_id,
+        "raw_score": score.raw_score,
+        "decayed_score": score.decayed_score,
+        "tier": score.tier,
+        "signal_count": score.signal_count,
+        "last_activity": score.last_activity.isoformat() if score.last_activity else None,
+        "top_signals": score.top_signals,
+        "calculated_at": score.calculated_at.isoformat(),
+    })
+
+
+def _load_score(contact_id: str, data: str) -> LeadScore:
+    fields = json.loads(data)
+    last_activity = fields.pop("last_activity")
+    calculated_at = fields.pop("calculated_at")
+    return LeadScore(
+        contact_id=contact_id,
+        last_activity=datetime.fromisoformat(last_activity) if last_activity else None,
+        calculated_at=datetime.fromisoformat(calculated_at),
+        **fields,
+    )
+
+
+class ScoreRepository:
+    """
+    Signal and score store behind LeadScorer.get_score.
+    
+    Signals are the source of truth and live in SQLite. Computed scores are
+    stored next to them, keyed by contact and the scorer's weights (see
+    weights_key), with the wall time they were computed; recording a signal
+    deletes the contact's stored scores in the same transaction. Lookups go
+    to an in-process LRU cache first (same key), then to stored scores no
+    older than ttl_seconds (decay makes them drift slowly), and only then
+    rescore from signals, so restarts and cache evictions do not repeat the
+    computation. Safe to share across threads.
+    """
+    
+    DEFAULT_PATH = Path(os.path.expanduser("~/.cache/bd-surface/lead_scores.db"))
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 10_000,
+        ttl_seconds: float = 300.0,
+        clock=time.monotonic,
+        wall_clock=time.time,
+    ):
+        self.path = path or str(self.DEFAULT_PATH)
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Optional[LeadScore]]]" = OrderedDict()
+        self._variants: Dict[str, set] = {}    # contact_id → weights keys in the cache
+        self._lock = threading.Lock()
+        self._writes = 0    # bumped on every add; guards caching a stale miss
+        self._stats = {
+            "hits": 0, "stored_hits": 0, "misses": 0, "expired": 0,
+            "evictions": 0, "invalidations": 0,
+        }
+        
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS signals (
+                contact_id TEXT NOT NULL,
+                org_id TEXT,
+                signal_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                source TEXT NOT NULL,
+                metadata TEXT
+            );
+            CREATE INDEX IF NOT EXISTS signals_contact ON signals (contact_id);
+            CREATE TABLE IF NOT EXISTS scores (
+                contact_id TEXT NOT NULL,
+                weights_key TEXT NOT NULL,
+                computed_at REAL NOT NULL,
+                score TEXT NOT NULL,
+                PRIMARY KEY (contact_id, weights_key)
+            );
+        """)
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+    
+    def add_signals(
+        self,
+        contact_id: str,
+        signals: List[EngagementSignal],
+        org_id: Optional[str] = None,
+    ):
+        """Persist signals for a contact and invalidate its cached and stored scores."""
+        rows = [
+            (
+                contact_id,
+                org_id,
+                s.signal_type.value,
+                s.timestamp.isoformat(),
+                s.source,
+                json.dumps(s.metadata) if s.metadata else None,
+            )
+            for s in signals
+        ]
+        with self._lock:
+            with self._db:
+                self._db.executemany("INSERT INTO signals VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._db.execute("DELETE FROM scores WHERE contact_id = ?", (contact_id,))
+            self._writes += 1
+            self._invalidate(contact_id)
+    
+    def add_signal(self, contact_id: str, signal: EngagementSignal, org_id: Optional[str] = None):
+        self.add_signals(contact_id, [signal], org_id)
+    
+    @staticmethod
+    def _parse(rows) -> Tuple[List[EngagementSignal], Optional[str]]:
+        org_id = None
+        signals = []
+        for row_org, signal_type, timestamp, source, metadata in rows:
+            org_id = row_org or org_id
+            signals.append(EngagementSignal(
+                signal_type=SignalType(signal_type),
+                timestamp=datetime.fromisoformat(timestamp),
+                source=source,
+                metadata=json.loads(metadata) if metadata else {},
+            ))
+        return signals, org_id
+    
+    def signals(self, contact_id: str) -> Tuple[List[EngagementSignal], Optional[str]]:
+        """Stored signals for a contact in insertion order, plus its latest org."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT org_id, signal_type, timestamp, source, metadata "
+                "FROM signals WHERE contact_id = ? ORDER BY rowid",
+                (contact_id,),
+            ).fetchall()
+        return self._parse(rows)
+    
+    def signals_many(
+        self,
+        contact_ids: List[str],
+        chunk_size: int = 500,
+    ) -> Dict[str, Tuple[List[EngagementSignal], Optional[str]]]:
+        """signals() for many contacts with one IN query per `chunk_size` ids; contacts without signals are omitted."""
+        grouped: Dict[str, list] = {}
+        with self._lock:
+            for start in range(0, len(contact_ids), chunk_size):
+                chunk = contact_ids[start:start + chunk_size]
+                rows = self._db.execute(
+                    "SELECT contact_id, org_id, signal_type, timestamp, source, metadata "
+                    f"FROM signals WHERE contact_id IN ({','.join('?' * len(chunk))}) ORDER BY rowid",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    grouped.setdefault(row[0], []).append(row[1:])
+        return {contact_id: self._parse(rows) for contact_id, rows in grouped.items()}
+    
+    def _stored(self, contact_ids: List[str], key: str, chunk_size: int = 500) -> Dict[str, LeadScore]:
+        """Stored scores younger than ttl_seconds for `key`; caller holds the lock."""
+        oldest = self.wall_clock() - self.ttl_seconds
+        found = {}
+        for start in range(0, len(contact_ids), chunk_size):
+            chunk = contact_ids[start:start + chunk_size]
+            rows = self._db.execute(
+                "SELECT contact_id, score FROM scores WHERE weights_key = ? AND computed_at > ? "
+                f"AND contact_id IN ({','.join('?' * len(chunk))})",
+                [key, oldest, *chunk],
+            ).fetchall()
+            for contact_id, data in rows:
+                found[contact_id] = _load_score(contact_id, data)
+        self._stats["stored_hits"] += len(found)
+        return found
+    
+    def _persist(self, key: str, scores: Dict[str, Optional[LeadScore]]):
+        """Store computed scores under `key`; caller holds the lock."""
+        computed_at = self.wall_clock()
+        rows = [
+            (contact_id, key, computed_at, _dump_score(score))
+            for contact_id, score in scores.items() if score is not None
+        ]
+        if rows:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)", rows)
+    
+    def _invalidate(self, contact_id: str):
+        for key in self._variants.pop(contact_id, ()):
+            del self._cache[(contact_id, key)]
+            self._stats["invalidations"] += 1
+    
+    def invalidate(self, contact_id: Optional[str] = None):
+        """Drop one contact's cached and stored scores, or all of them."""
+        with self._lock:
+            with self._db:
+                if contact_id is None:
+                    self._db.execute("DELETE FROM scores")
+                else:
+                    self._db.execute("DELETE FROM scores WHERE contact_id = ?", (contact_id,))
+            if contact_id is None:
+                self._stats["invalidations"] += len(self._cache)
+                self._cache.clear()
+                self._variants.clear()
+            else:
+                self._invalidate(contact_id)
+    
+    def _cached(self, contact_id: str, key: str, now: float) -> Tuple[bool, Optional[LeadScore]]:
+        """(hit, score) from the cache, counting hits/expiries/misses; caller holds the lock."""
+        cached = self._cache.get((contact_id, key))
+        if cached is not None:
+            if now - cached[0] < self.ttl_seconds:
+                self._cache.move_to_end((contact_id, key))
+                self._stats["hits"] += 1
+                return True, cached[1]
+            self._drop(contact_id, key)
+            self._stats["expired"] += 1
+        self._stats["misses"] += 1
+        return False, None
+    
+    def _drop(self, contact_id: str, key: str):
+        del self._cache[(contact_id, key)]
+        variants = self._variants[contact_id]
+        variants.discard(key)
+        if not variants:
+            del self._variants[contact_id]
+    
+    def _store(self, contact_id: str, key: str, now: float, score: Optional[LeadScore]):
+        """Cache a score, evicting LRU entries; caller holds the lock."""
+        self._cache[(contact_id, key)] = (now, score)
+        self._cache.move_to_end((contact_id, key))
+        self._variants.setdefault(contact_id, set()).add(key)
+        while len(self._cache) > self.capacity:
+            self._drop(*next(iter(self._cache)))
+            self._stats["evictions"] += 1
+    
+    def get(self, contact_id: str, scorer: "LeadScorer") -> Optional[LeadScore]:
+        """
+        Score for a contact under `scorer`'s weights: cached, stored, or
+        computed from signals. Returns None for contacts with no stored signals.
+        """
+        key = weights_key(scorer.weights)
+        now = self.clock()
+        with self._lock:
+            hit, score = self._cached(contact_id, key, now)
+        if hit:
+            return score
+        return self._load([contact_id], key, now, scorer)[contact_id]
+    
+    def get_many(self, contact_ids: Iterable[str], scorer: "LeadScorer") -> Dict[str, Optional[LeadScore]]:
+        """
+        get() for many contacts: cache hits are read under one lock, stored
+        scores and then signals for the rest are loaded with batched IN
+        queries (see signals_many).
+        """
+        key = weights_key(scorer.weights)
+        now = self.clock()
+        results: Dict[str, Optional[LeadScore]] = {}
+        misses = []
+        with self._lock:
+            for contact_id in dict.fromkeys(contact_ids):
+                hit, score = self._cached(contact_id, key, now)
+                if hit:
+                    results[contact_id] = score
+                else:
+                    misses.append(contact_id)
+        if misses:
+            results.update(self._load(misses, key, now, scorer))
+        return results
+    
+    def _load(
+        self,
+        contact_ids: List[str],
+        key: str,
+        now: float,
+        scorer: "LeadScorer",
+    ) -> Dict[str, Optional[LeadScore]]:
+        """Cache misses: stored scores where fresh, else computed from signals and stored."""
+        with self._lock:
+            results: Dict[str, Optional[LeadScore]] = self._stored(contact_ids, key)
+            for contact_id, score in results.items():
+                self._store(contact_id, key, now, score)
+            writes = self._writes
+        misses = [c for c in contact_ids if c not in results]
+        if not misses:
+            return results
+        
+        loaded = self.signals_many(misses)
+        computed = {}
+        for contact_id in misses:
+            signals, org_id = loaded.get(contact_id, ([], None))
+            computed[contact_id] = scorer.calculate(contact_id, signals, org_id=org_id) if signals else None
+        results.update(computed)
+        
+        with self._lock:
+            # Signals arrived meanwhile: these scores may already be stale
+            if writes == self._writes:
+                self._persist(key, computed)
+                for contact_id, score in computed.items():
+                    self._store(contact_id, key, now, score)
+        return results
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters and hit rate (stored_hits count towards misses)."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._cache),
+                "capacity": self.capacity,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
+
+
+if __name__ == "__main__":
+    from datetime import timedelta
+    from .lead_scoring import LeadScorer
+    
+    print("Testing Score Repository...")
+    
+    repo = ScoreRepository(":memory:", capacity=100, ttl_seconds=60)
+    scorer = LeadScorer(repository=repo)
+    now = datetime.utcnow()
+    
+    for i in range(200):
+        scorer.record_signal(
+            f"contact-{i:03d}",
+            EngagementSignal(SignalType.EMAIL_REPLY, now - timedelta(days=i % 30)),
+            org_id=f"org-{i % 10}",
+        )
+    
+    assert scorer.get_score("contact-unknown") is None
+    first = scorer.get_score("contact-007")
+    assert scorer.get_score("contact-007") is first
+    
+    scorer.record_signal("contact-007", EngagementSignal(SignalType.INBOUND_REQUEST, now))
+    updated = scorer.get_score("contact-007")
+    assert updated.decayed_score > first.decayed_score and updated.org_id == "org-7"
+    
+    # Batch lookups agree with single ones and fill the cache
+    repo.invalidate()
+    ids = [f"contact-{i:03d}" for i in range(0, 200, 3)] + ["contact-unknown"]
+    batch = scorer.get_scores(ids)
+    assert batch["contact-unknown"] is None
+    for contact_id in ids:
+        single = scorer.get_score(contact_id)
+        assert single is batch[contact_id] or single.decayed_score == batch[contact_id].decayed_score
+    
+    start = time.perf_counter()
+    for _ in range(10):
+        for i in range(50):
+            scorer.get_score(f"contact-{i:03d}")
+    elapsed = time.perf_counter() - start
+    
+    # Stored scores outlive the process cache; weights never share scores
+    import tempfile
+    from .lead_scoring import ScoringWeights
+    
+    class CountingScorer(LeadScorer):
+        calls = 0
+        
+        def calculate(self, *args, **kwargs):
+            CountingScorer.calls += 1
+            return super().calculate(*args, **kwargs)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scores.db")
+        wall = [1000.0]
+        stored = ScoreRepository(path, ttl_seconds=60, clock=lambda: wall[0], wall_clock=lambda: wall[0])
+        counting = CountingScorer(repository=stored)
+        counting.record_signal("c1", EngagementSignal(SignalType.REFERRAL, now), org_id="org-1")
+        computed = counting.get_score("c1")
+        stored.close()
+        
+        restarted = ScoreRepository(path, ttl_seconds=60, clock=lambda: wall[0], wall_clock=lambda: wall[0])
+        counting = CountingScorer(repository=restarted)
+        reloaded = counting.get_score("c1")
+        assert CountingScorer.calls == 1 and restarted.get_stats()["stored_hits"] == 1
+        assert reloaded == computed
+        
+        heavy = CountingScorer(ScoringWeights(referral=300), repository=restarted)
+        assert heavy.get_score("c1").decayed_score > 9 * reloaded.decayed_score
+        assert counting.get_score("c1") is reloaded
+        
+        # A new signal drops the stored score along with the cached one
+        counting.record_signal("c1", EngagementSignal(SignalType.EMAIL_OPEN, now))
+        assert counting.get_score("c1").signal_count == 2
+        
+        calls = CountingScorer.calls
+        wall[0] += 61
+        counting.get_score("c1")
+        assert CountingScorer.calls == calls + 1    # stored score past the TTL is recomputed
+    
+    print(f"\nStats: {repo.get_stats()}")
+    print(f"Average lookup: {elapsed / 500 * 1e6:.1f} µs")
+    
+    print("\n✓ Score repository working")
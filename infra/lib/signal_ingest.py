@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Streaming Signal Ingestion for BD Surface.
+Tails activity logs (BDActivityLog files and scripts/activity_log.py's
+activity.jsonl), maps entries to engagement signals through configurable
+rules and feeds them to incremental scorers in micro-batches.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass
+
+from .lead_scoring import EngagementSignal, SignalType
+from .incremental_scoring import IncrementalScorer
+
+DEFAULT_RULES_FILE = Path(__file__).resolve().parents[2] / "config" / "signal-ingest-rules.json"
+
+# (contact_id, signal, org_id)
+IngestedSignal = Tuple[str, EngagementSignal, Optional[str]]
+
+
+def _lookup(entry: Dict[str, Any], path: str) -> Any:
+    """Value at a dotted path, or None."""
+    value: Any = entry
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _to_utc_naive(text: str) -> datetime:
+    ts = datetime.fromisoformat(text)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+@dataclass
+class IngestRule:
+    """
+    Maps matching log entries to one signal type.
+    
+    `when` maps dotted field paths to conditions: a value (equality), a list
+    (any of), "*" (present and non-empty), or {"prefix": s} / {"contains": s}
+    (case-insensitive). The signal type is fixed (`signal_type`) or read from
+    a field (`signal_type_from`).
+    """
+    name: str
+    when: Dict[str, Any]
+    contact: str
+    org: Optional[str] = None
+    signal_type: Optional[str] = None
+    signal_type_from: Optional[str] = None
+    description: str = ""
+    
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        for path, condition in self.when.items():
+            value = _lookup(entry, path)
+            if condition == "*":
+                if value in (None, "", [], {}):
+                    return False
+            elif isinstance(condition, list):
+                if value not in condition:
+                    return False
+            elif isinstance(condition, dict):
+                if not isinstance(value, str):
+                    return False
+                text = value.lower()
+                if "prefix" in condition and not text.startswith(condition["prefix"].lower()):
+                    return False
+                if "contains" in condition and condition["contains"].lower() not in text:
+                    return False
+            elif value != condition:
+                return False
+        return True
+    
+    def apply(self, entry: Dict[str, Any]) -> Optional[IngestedSignal]:
+        type_value = _lookup(entry, self.signal_type_from) if self.signal_type_from else self.signal_type
+        try:
+            signal_type = SignalType(type_value)
+        except ValueError:
+            return None
+        contact_id = _lookup(entry, self.contact)
+        if not contact_id:
+            return None
+        signal = EngagementSignal(
+            signal_type=signal_type,
+            timestamp=_to_utc_naive(entry["timestamp"]),
+            source=f"activity_log:{self.name}",
+        )
+        return contact_id, signal, _lookup(entry, self.org) if self.org else None
+
+
+def load_rules(path: Optional[Path] = None) -> List[IngestRule]:
+    """Load ordered ingest rules from JSON (default: config/signal-ingest-rules.json)."""
+    with open(path or DEFAULT_RULES_FILE) as f:
+        return [IngestRule(**rule) for rule in json.load(f)]
+
+
+class LogTailer:
+    """
+    Follows one JSONL file from a byte offset, like `tail -F`.
+    
+    The file stays open between reads, so when it is rotated (renamed away
+    and recreated) the old handle is drained to EOF before switching to the
+    new file. A truncated file is re-read from the start. Only complete
+    lines are returned.
+    
+    `offset` is how far the file has been read; `applied` is how far the
+    caller has acted on it (see mark()). Only `applied` is saved as state,
+    so lines read but not yet applied are read again after a restart.
+    """
+    
+    def __init__(self, path: str, offset: int = 0, inode: Optional[int] = None):
+        self.path = str(path)
+        self.offset = offset
+        self.applied = offset
+        self.inode = inode
+        self._fh = None
+    
+    @property
+    def state(self) -> Dict[str, Any]:
+        return {"offset": self.applied, "inode": self.inode}
+    
+    def mark(self, end: int):
+        """Record that lines up to byte `end` of the current file are applied."""
+        self.applied = end
+    
+    def _open(self) -> bool:
+        try:
+            fh = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        inode = os.fstat(fh.fileno()).st_ino
+        if inode != self.inode:
+            self.offset = self.applied = 0
+            self.inode = inode
+        self._fh = fh
+        return True
+    
+    def close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+    
+    def read_lines(self, max_bytes: int = 1 << 20) -> List[Tuple[bytes, int]]:
+        """Complete lines from up to `max_bytes` of new data, each with its end offset."""
+        if self._fh is None and not self._open():
+            return []
+        
+        if os.fstat(self._fh.fileno()).st_size < self.offset:
+            self.offset = self.applied = 0     # truncated in place
+        self._fh.seek(self.offset)
+        data = self._fh.read(max_bytes)
+        end = data.rfind(b"\n") + 1
+        if end:
+            lines = []
+            position = self.offset
+            for line in data[:end].splitlines(keepends=True):
+                position += len(line)
+                lines.append((line.rstrip(b"\r\n"), position))
+            self.offset += end
+            return lines
+        
+        # Nothing new here; if the path now points at a new file, switch to it
+        try:
+            rotated = os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            rotated = False
+        if rotated:
+            self.close()
+            if self._open():
+                return self.read_lines(max_bytes)
+        return []
+
+
+class SignalIngestor:
+    """
+    Activity logs → rules → dedupe → micro-batches → scorers.
+    
+    Targets are any objects with add_signal(contact_id, signal, org_id)
+    (IncrementalScorer, TierScheduler, ScoreRepository); targets that also
+    have add_signals(contact_id, signals, org_id) get one call per contact
+    per batch. After each applied batch, every log's offset up to the last
+    line handled (applied, or skipped as unmapped, bad or duplicate) is
+    saved to `state_file`; lines read beyond it are not, so a restart
+    resumes without loss even mid-chunk. Recently seen
+    (contact, type, timestamp) keys are dropped as duplicates, which covers
+    the same interaction being logged by more than one writer.
+    """
+    
+    def __init__(
+        self,
+        paths: List[str],
+        targets: Optional[List[Any]] = None,
+        rules: Optional[List[IngestRule]] = None,
+        state_file: Optional[str] = None,
+        batch_size: int = 500,
+        dedupe_size: int = 100_000,
+    ):
+        self.targets = targets if targets is not None else [IncrementalScorer()]
+        self.rules = rules if rules is not None else load_rules()
+        self.state_file = state_file
+        self.batch_size = batch_size
+        self.dedupe_size = dedupe_size
+        self._seen: "OrderedDict[Tuple[str, str, str], None]" = OrderedDict()
+        self._batch: List[IngestedSignal] = []
+        self.stats = defaultdict(int)
+        
+        saved = self._load_state()
+        self.tailers = [LogTailer(p, **saved.get(str(p), {})) for p in paths]
+    
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file) as f:
+            return json.load(f).get("sources", {})
+    
+    def _save_state(self):
+        if not self.state_file:
+            return
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"sources": {t.path: t.state for t in self.tailers}}, f)
+        os.replace(tmp, self.state_file)
+    
+    def map_entry(self, entry: Dict[str, Any]) -> Optional[IngestedSignal]:
+        """First matching rule's signal for an entry, if any."""
+        for rule in self.rules:
+            if rule.matches(entry):
+                mapped = rule.apply(entry)
+                if mapped:
+                    self.stats[f"rule:{rule.name}"] += 1
+                return mapped
+        return None
+    
+    def _is_duplicate(self, item: IngestedSignal) -> bool:
+        contact_id, signal, _ = item
+        key = (contact_id, signal.signal_type.value, signal.timestamp.isoformat())
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return True
+        self._seen[key] = None
+        if len(self._seen) > self.dedupe_size:
+            self._seen.popitem(last=False)
+        return False
+    
+    def flush(self):
+        """Apply the pending micro-batch to every target and save offsets."""
+        batch, self._batch = self._batch, []
+        if batch:
+            for target in self.targets:
+                if hasattr(target, "add_signals"):
+                    grouped: Dict[Tuple[str, Optional[str]], List[EngagementSignal]] = defaultdict(list)
+                    for contact_id, signal, org_id in batch:
+                        grouped[(contact_id, org_id)].append(signal)
+                    for (contact_id, org_id), signals in grouped.items():
+                        target.add_signals(contact_id, signals, org_id)
+                else:
+                    for contact_id, signal, org_id in batch:
+                        target.add_signal(contact_id, signal, org_id)
+            self.stats["ingested"] += len(batch)
+            self.stats["batches"] += 1
+        self._save_state()
+    
+    def poll(self) -> int:
+        """Read everything new from every log. Returns signals ingested."""
+        before = self.stats["ingested"]
+        for tailer in self.tailers:
+            while True:
+                lines = tailer.read_lines()
+                if not lines:
+                    break
+                for line, end in lines:
+                    self.stats["lines"] += 1
+                    # Handled once it is skipped or in the batch: flush() applies the batch first
+                    tailer.mark(end)
+                    try:
+                        entry = json.loads(line)
+                        item = self.map_entry(entry)
+                    except (ValueError, KeyError, TypeError):
+                        self.stats["bad_lines"] += 1
+                        continue
+                    if item is None:
+                        continue
+                    if self._is_duplicate(item):
+                        self.stats["duplicates"] += 1
+                        continue
+                    self._batch.append(item)
+                    if len(self._batch) >= self.batch_size:
+                        self.flush()
+        self.flush()
+        return self.stats["ingested"] - before
+    
+    def run(self, interval: float = 1.0, stop: Optional[threading.Event] = None):
+        """Poll until `stop` is set, sleeping `interval` seconds when idle."""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                if not self.poll():
+                    stop.wait(interval)
+        finally:
+            for tailer in self.tailers:
+                tailer.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from datetime import timedelta
+    from .activity_log import BDActivityLog, SignalCategory, ContactInfo
+    from .lead_scoring import LeadScorer
+    
+    print("Testing Signal Ingestion...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        bd_log_path = os.path.join(tmp, "bd-activity.jsonl")
+        agent_log_path = os.path.join(tmp, "activity.jsonl")
+        state_path = os.path.join(tmp, "ingest-state.json")
+        start = datetime.utcnow() - timedelta(hours=1)
+        
+        bd_log = BDActivityLog(log_file=bd_log_path, sync_to_notion=False)
+        for i in range(20):
+            bd_log.log_routing(
+                user_input=f"Intake submission sub-{i}",
+                signal=SignalCategory.INTELLIGENCE,
+                confidence=0.9,
+                target_agent="Sales Growth Engine",
+                evidence=["referral"],
+                session_id=f"sub-{i}",
+                source_channel="api",
+                contact=ContactInfo(person_id=f"contact-{i % 5}", org_id=f"org-{i % 2}"),
+            )
+        
+        def agent_entry(i: int, action: str) -> str:
+            return json.dumps({
+                "timestamp": (start + timedelta(minutes=i)).replace(tzinfo=timezone.utc).isoformat(),
+                "agent": "liaison", "session": "s", "category": "human",
+                "action": action, "details": "", "outcome": "success",
+                "metadata": {"contact_id": f"contact-{i % 5}"},
+            }) + "\n"
+        
+        with open(agent_log_path, "w") as f:
+            f.writelines(agent_entry(i, "meeting_completed") for i in range(10))
+            f.write(agent_entry(3, "meeting_completed"))      # double-logged
+            f.write('{"timestamp": "broken')                   # partial line
+        
+        class Recorder:
+            def add_signal(self, contact_id, signal, org_id=None):
+                delivered[contact_id].append(signal)
+        
+        delivered: Dict[str, List[EngagementSignal]] = defaultdict(list)
+        incremental = IncrementalScorer()
+        ingestor = SignalIngestor(
+            [bd_log_path, agent_log_path],
+            [incremental, Recorder()],
+            state_file=state_path,
+            batch_size=8,
+        )
+        assert ingestor.poll() == 30
+        assert ingestor.stats["duplicates"] == 1
+        
+        # Rotation: finish the old file, then follow the new one
+        with open(agent_log_path, "a") as f:
+            f.write('\n')                                    # writer died mid-line
+        os.rename(agent_log_path, agent_log_path + ".1")
+        with open(agent_log_path, "w") as f:
+            f.writelines(agent_entry(i, "meeting_scheduled") for i in range(10, 15))
+        assert ingestor.poll() == 5 and ingestor.stats["bad_lines"] == 1
+        
+        # Restart from saved offsets: nothing is re-ingested
+        with open(agent_log_path, "a") as f:
+            f.write(agent_entry(20, "meeting_booked"))
+        restarted = SignalIngestor([bd_log_path, agent_log_path], [IncrementalScorer()], state_file=state_path)
+        assert restarted.poll() == 1
+        
+        # A crash mid-chunk loses nothing: saved offsets only cover applied batches
+        crash_log_path = os.path.join(tmp, "crash.jsonl")
+        crash_state_path = os.path.join(tmp, "crash-state.json")
+        with open(crash_log_path, "w") as f:
+            f.writelines(agent_entry(i, "meeting_completed").replace("contact-", "crash-") for i in range(50))
+        
+        class Crashing:
+            def __init__(self, fail_on_batch=None):
+                self.fail_on_batch = fail_on_batch
+                self.batches = 0
+                self.received = []
+            
+            def add_signal(self, contact_id, signal, org_id=None):
+                if self.batches == self.fail_on_batch:
+                    raise RuntimeError("target went away")
+                self.received.append(signal.timestamp)
+        
+        crashing = Crashing(fail_on_batch=2)
+        first = SignalIngestor([crash_log_path], [crashing], state_file=crash_state_path, batch_size=8)
+        first.flush = lambda flush=first.flush: (flush(), setattr(crashing, "batches", crashing.batches + 1))
+        try:
+            first.poll()
+            raise AssertionError("target failure not raised")
+        except RuntimeError:
+            pass
+        assert len(crashing.received) == 16
+        resumed = Crashing()
+        assert SignalIngestor([crash_log_path], [resumed], state_file=crash_state_path).poll() == 34
+        assert sorted(crashing.received + resumed.received) == sorted(
+            start + timedelta(minutes=i) for i in range(50)
+        )
+        
+        # Incremental scores match a full rescore of what was delivered
+        now = datetime.utcnow()
+        scorer = LeadScorer()
+        for contact_id, signals in delivered.items():
+            expected = scorer.calculate(contact_id, signals, reference_time=now)
+            got = incremental.score_at(contact_id, now)
+            assert abs(expected.decayed_score - got.decayed_score) < 1e-9 * max(1.0, expected.decayed_score)
+        
+        print(f"\nStats: {dict(ingestor.stats)}")
+        print(f"Top contact: {incremental.score_at('contact-0', now).to_dict()}")
+    
+    print("\n✓ Signal ingestion working")
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Spam Detection for BD Surface intake.
+Matches submissions against large, hot-reloadable lists of disposable email
+domains and spam phrases in a single pass per field.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Union
+
+# Optional Aho-Corasick backend (pip install pyahocorasick)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+DEFAULT_DOMAINS_FILE = CONFIG_DIR / "spam-domains.txt"
+DEFAULT_PHRASES_FILE = CONFIG_DIR / "spam-phrases.txt"
+
+
+def read_list(path: Union[str, Path]) -> List[str]:
+    """Lowercased entries of a one-per-line list file, skipping blanks and # comments."""
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip().lower()
+            if line and not line.startswith("#"):
+                entries.append(line)
+    return entries
+
+
+def trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    One regex alternation shaped as a prefix trie of `phrases`.
+    
+    The regex engine walks the trie once per text position instead of
+    trying each phrase in turn. A phrase that extends a shorter one is
+    dropped: for "does any phrase occur" the shorter match suffices.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        if not phrase:
+            continue
+        node = trie
+        for ch in phrase:
+            if "" in node:
+                break
+            node = node.setdefault(ch, {})
+        else:
+            node.clear()
+            node[""] = True
+    
+    def build(node: Dict[str, Any]) -> str:
+        if "" in node:
+            return ""
+        singles, branches = [], []
+        for ch, child in sorted(node.items()):
+            rest = build(child)
+            if rest:
+                branches.append(re.escape(ch) + rest)
+            else:
+                singles.append(re.escape(ch))
+        if len(singles) > 1:
+            branches.append("[" + "".join(singles) + "]")
+        else:
+            branches.extend(singles)
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    
+    return build(trie) if trie else ""
+
+
+class PhraseMatcher:
+    """
+    Finds the first of many phrases in a text in one scan.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed (linear
+    in the text regardless of dictionary size), otherwise a compiled trie
+    regex (see trie_pattern).
+    """
+    
+    def __init__(self, phrases: Iterable[str], backend: str = "auto"):
+        phrases = sorted({p for p in phrases if p})
+        if backend == "auto":
+            backend = "ahocorasick" if AHOCORASICK_AVAILABLE else "regex"
+        if backend == "ahocorasick" and not AHOCORASICK_AVAILABLE:
+            raise ImportError("The ahocorasick backend requires pyahocorasick")
+        if backend not in ("ahocorasick", "regex"):
+            raise ValueError(f"Unknown matcher backend: {backend}")
+        self.backend = backend
+        self.size = len(phrases)
+        self._automaton = None
+        self._regex = None
+        if not phrases:
+            return
+        if backend == "ahocorasick":
+            self._automaton = ahocorasick.Automaton()
+            for phrase in phrases:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+        else:
+            self._regex = re.compile(trie_pattern(phrases))
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def search(self, text: str) -> Optional[str]:
+        """A phrase occurring in `text`, or None."""
+        if self._automaton is not None:
+            for _, phrase in self._automaton.iter(text):
+                return phrase
+        elif self._regex is not None:
+            match = self._regex.search(text)
+            if match:
+                return match.group()
+        return None
+
+
+class DomainSet:
+    """
+    Hashed set of blocked email domains.
+    
+    Entries with a dot match the domain and its subdomains, looked up one
+    suffix at a time; bare labels ("mailinator") match any label of the
+    domain. Cost is a few set probes per address whatever the list size.
+    """
+    
+    def __init__(self, entries: Iterable[str]):
+        entries = list(entries)
+        self.suffixes = frozenset(e.strip(".") for e in entries if "." in e.strip("."))
+        self.labels = frozenset(e for e in entries if e and "." not in e.strip("."))
+    
+    def __len__(self) -> int:
+        return len(self.suffixes) + len(self.labels)
+    
+    @staticmethod
+    def domain_of(email: str) -> str:
+        _, at, domain = email.rpartition("@")
+        return domain.strip().rstrip(".").lower() if at else ""
+    
+    def match(self, email: str) -> Optional[str]:
+        """The entry blocking `email`'s domain, or None."""
+        labels = self.domain_of(email).split(".")
+        if labels == [""]:
+            return None
+        for i in range(len(labels) - 1):
+            suffix = ".".join(labels[i:])
+            if suffix in self.suffixes:
+                return suffix
+        for label in labels:
+            if label in self.labels:
+                return label
+        return None
+
+
+@dataclass
+class _Lists:
+    domains: DomainSet
+    phrases: PhraseMatcher
+    versions: Tuple[Optional[int], Optional[int]]   # file mtimes (ns) when loaded
+
+
+class SpamFilter:
+    """
+    Spam indicators for intake submissions.
+    
+    A submission is spam when at least `min_indicators` of these hold: no
+    org name, a disposable email domain, a spam phrase in the message.
+    Lists are read from config/spam-domains.txt and spam-phrases.txt; the
+    files are re-checked at most every `check_interval` seconds and
+    recompiled when changed, swapping in the new matchers in one
+    assignment. Safe to share across threads.
+    """
+    
+    def __init__(
+        self,
+        domains_file: Optional[Union[str, Path]] = None,
+        phrases_file: Optional[Union[str, Path]] = None,
+        min_indicators: int = 2,
+        check_interval: Optional[float] = 30.0,
+        backend: str = "auto",
+        clock=time.monotonic,
+    ):
+        self.domains_file = Path(domains_file or DEFAULT_DOMAINS_FILE)
+        self.phrases_file = Path(phrases_file or DEFAULT_PHRASES_FILE)
+        self.min_indicators = min_indicators
+        self.check_interval = check_interval
+        self.backend = backend
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._lists: Optional[_Lists] = None
+        self._checked_at = clock()
+        self.reload(force=True)
+    
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def reload(self, force: bool = False) -> bool:
+        """
+        Recompile the lists if either file changed since the last load.
+        A missing file counts as an empty list.
+        
+        Returns:
+            True if new lists were loaded
+        """
+        with self._lock:
+            self._checked_at = self.clock()
+            versions = (self._mtime(self.domains_file), self._mtime(self.phrases_file))
+            if not force and self._lists is not None and versions == self._lists.versions:
+                return False
+            domains = read_list(self.domains_file) if versions[0] is not None else []
+            phrases = read_list(self.phrases_file) if versions[1] is not None else []
+            self._lists = _Lists(DomainSet(domains), PhraseMatcher(phrases, self.backend), versions)
+            return True
+    
+    def _current(self) -> _Lists:
+        if self.check_interval is not None and self.clock() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._lists
+    
+    def indicators(self, submission: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Each spam indicator with what triggered it (None when it does not hold).
+        """
+        lists = self._current()
+        return {
+            "no_org": None if submission.get("org_name") else "missing org_name",
+            "disposable_email": lists.domains.match(submission.get("email") or ""),
+            "spam_phrase": lists.phrases.search((submission.get("message") or "").lower()),
+        }
+    
+    def is_spam(self, submission: Dict[str, Any]) -> bool:
+        lists = self._current()
+        hits = 0 if submission.get("org_name") else 1
+        if lists.domains.match(submission.get("email") or ""):
+            hits += 1
+        # The phrase scan is the expensive check: skip it when it cannot change the answer
+        if hits >= self.min_indicators or hits + 1 < self.min_indicators:
+            return hits >= self.min_indicators
+        if lists.phrases.search((submission.get("message") or "").lower()):
+            hits += 1
+        return hits >= self.min_indicators
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lists = self._lists
+        return {
+            "domains": len(lists.domains),
+            "phrases": len(lists.phrases),
+            "backend": lists.phrases.backend,
+        }
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    
+    print("Testing Spam Filter...")
+    
+    # Each backend finds a phrase exactly when a naive scan does
+    rng = random.Random(47)
+    alphabet = "abcde .-"
+    phrases = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) for _ in range(300)}
+    texts = ["".join(rng.choice(alphabet + "xyz") for _ in range(rng.randint(0, 40))) for _ in range(3000)]
+    for backend in ["regex"] + (["ahocorasick"] if AHOCORASICK_AVAILABLE else []):
+        matcher = PhraseMatcher(phrases, backend=backend)
+        for text in texts:
+            found = matcher.search(text)
+            assert (found is not None) == any(p in text for p in phrases), (backend, text)
+            assert found is None or found in text
+    
+    domains = DomainSet(["mailinator", "test.com", "yopmail.com"])
+    assert domains.match("bob@mailinator.net") == "mailinator"
+    assert domains.match("bob@mx.Test.com") == "test.com"
+    assert domains.match("bob@latest.com") is None
+    assert domains.match("mailinator-fan@gmail.com") is None
+    assert domains.match("not-an-email") is None
+    
+    spam = SpamFilter(check_interval=None)
+    assert spam.is_spam({"email": "x@mailinator.com", "message": "hi"})
+    assert spam.is_spam({"org_name": "Acme", "email": "x@yopmail.com", "message": "Crypto AIRDROP inside"})
+    assert not spam.is_spam({"org_name": "Acme", "email": "x@yopmail.com", "message": "hello"})
+    assert not spam.is_spam({"org_name": None, "email": None, "message": None})
+    print(f"\nDefault lists: {spam.get_stats()}")
+    
+    # Agrees with the full indicator count at any threshold
+    samples = [
+        {"org_name": rng.choice(["Acme", None]), "email": rng.choice(["a@yopmail.com", "a@acme.com"]),
+         "message": rng.choice(["viagra deal", "hello"])}
+        for _ in range(200)
+    ]
+    for threshold in (1, 2, 3):
+        spam.min_indicators = threshold
+        for s in samples:
+            count = sum(v is not None for v in spam.indicators(s).values())
+            assert spam.is_spam(s) == (count >= threshold), (threshold, s)
+    
+    # Edited lists are picked up after check_interval without a restart
+    with tempfile.TemporaryDirectory() as tmp:
+        now = [0.0]
+        domains_file = os.path.join(tmp, "domains.txt")
+        phrases_file = os.path.join(tmp, "phrases.txt")
+        with open(domains_file, "w") as f:
+            f.write("# none yet\n")
+        live = SpamFilter(domains_file, phrases_file, check_interval=10, clock=lambda: now[0])
+        sub = {"email": "a@spam.example", "message": "win free tokens"}
+        assert not live.is_spam(sub)
+        with open(domains_file, "w") as f:
+            f.write("spam.example\n")
+        os.utime(domains_file, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        now[0] = 5
+        assert not live.is_spam(sub)
+        now[0] = 11
+        assert live.is_spam(sub)
+        assert not live.reload()
+    
+    print("\n✓ Spam filter working")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Lead Tier Transition Scheduler for BD Surface.
+Predicts when decaying scores cross tier thresholds and emits tier changes
+at those moments instead of rescoring every lead.
+"""
+
+import heapq
+import itertools
+import math
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass
+
+from .lead_scoring import EngagementSignal
+from .incremental_scoring import IncrementalScorer
+from .vector_scoring import TIERS
+
+# Re-check delay when a predicted crossing lands a hair early (float rounding)
+RETRY_DELAY = timedelta(milliseconds=1)
+
+
+@dataclass
+class TierChange:
+    """A lead moving between tiers."""
+    contact_id: str
+    old_tier: str
+    new_tier: str
+    at: datetime
+    score: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "contact_id": self.contact_id,
+            "old_tier": self.old_tier,
+            "new_tier": self.new_tier,
+            "at": self.at.isoformat(),
+            "score": round(self.score, 1),
+        }
+
+
+class TierScheduler:
+    """
+    Min-heap of the next time each lead's tier can change on its own.
+    
+    Between signals a score is decaying * 0.5 ** (d / half_life) + constant
+    (see IncrementalScorer.projection), so the time it falls below its tier's
+    lower threshold is a logarithm away. Each contact has one live heap
+    entry: the earlier of that crossing and the next boost lapse (which
+    changes the curve and needs a re-plan). New signals re-plan the contact
+    immediately; superseded heap entries are skipped on pop.
+    """
+    
+    def __init__(self, scorer: Optional[IncrementalScorer] = None, start: Optional[datetime] = None):
+        self.scorer = scorer or IncrementalScorer()
+        self.weights = self.scorer.weights
+        self.now = start or datetime.utcnow()
+        self._heap: List[Tuple[datetime, int, str, int]] = []
+        self._tiers: Dict[str, str] = {}
+        self._versions: Dict[str, int] = {}
+        self._seq = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._tiers)
+    
+    def tier_of(self, contact_id: str) -> str:
+        return self._tiers.get(contact_id, "dormant")
+    
+    def next_event_time(self) -> Optional[datetime]:
+        """Earliest scheduled check, skipping superseded entries."""
+        while self._heap:
+            at, _, contact_id, version = self._heap[0]
+            if self._versions.get(contact_id) == version:
+                return at
+            heapq.heappop(self._heap)
+        return None
+    
+    def _lower_threshold(self, tier: str) -> Optional[float]:
+        return {
+            "hot": self.weights.hot_threshold,
+            "warm": self.weights.warm_threshold,
+            "cold": self.weights.cold_threshold,
+        }.get(tier)
+    
+    def _check(self, contact_id: str, at: datetime) -> Optional[TierChange]:
+        """Read the contact at `at`, record any tier change and re-plan."""
+        decaying, constant, next_change = self.scorer.projection(contact_id, at)
+        score = decaying + constant
+        tier = self.scorer.scorer._get_tier(score)
+        old_tier = self.tier_of(contact_id)
+        self._tiers[contact_id] = tier
+        
+        version = self._versions.get(contact_id, 0) + 1
+        self._versions[contact_id] = version
+        wake = next_change
+        threshold = self._lower_threshold(tier)
+        if threshold is not None and constant < threshold and decaying > 0:
+            days = self.weights.decay_half_life_days * math.log2(decaying / (threshold - constant))
+            crossing = max(at + timedelta(days=days), at + RETRY_DELAY)
+            wake = crossing if wake is None else min(wake, crossing)
+        if wake is not None:
+            heapq.heappush(self._heap, (wake, next(self._seq), contact_id, version))
+        
+        if tier != old_tier:
+            return TierChange(contact_id, old_tier, tier, at, score)
+        return None
+    
+    def add_signal(
+        self,
+        contact_id: str,
+        signal: EngagementSignal,
+        org_id: Optional[str] = None,
+    ) -> Optional[TierChange]:
+        """Record a signal and re-plan the contact at the scheduler's current time."""
+        self.scorer.add_signal(contact_id, signal, org_id)
+        return self._check(contact_id, self.now)
+    
+    def advance(self, now: datetime) -> List[TierChange]:
+        """
+        Move the clock to `now`, returning tier changes in time order.
+        Each change is stamped with the moment it happened.
+        """
+        if now < self.now:
+            raise ValueError("TierScheduler time cannot move backwards")
+        changes = []
+        while True:
+            at = self.next_event_time()
+            if at is None or at > now:
+                break
+            _, _, contact_id, _ = heapq.heappop(self._heap)
+            change = self._check(contact_id, at)
+            if change:
+                changes.append(change)
+        self.now = now
+        return changes
+
+
+if __name__ == "__main__":
+    import random
+    from .lead_scoring import LeadScorer, SignalType
+    
+    print("Testing Tier Scheduler...")
+    
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1)
+    scheduler = TierScheduler(start=start)
+    scorer = LeadScorer()
+    history: Dict[str, List[Tuple[datetime, EngagementSignal]]] = {}
+    changes: List[TierChange] = []
+    
+    def known(contact_id: str, at: datetime) -> List[EngagementSignal]:
+        return [s for added, s in history[contact_id] if added <= at]
+    
+    now = start
+    for step in range(400):
+        if rng.random() < 0.5:
+            contact_id = f"contact-{rng.randrange(60):02d}"
+            signal = EngagementSignal(
+                rng.choice(list(SignalType)),
+                now - timedelta(days=rng.uniform(-0.5, 10)),
+            )
+            history.setdefault(contact_id, []).append((now, signal))
+            change = scheduler.add_signal(contact_id, signal)
+            if change:
+                changes.append(change)
+        else:
+            now += timedelta(hours=rng.uniform(0, 72))
+            changes.extend(scheduler.advance(now))
+            # Scheduler's tiers agree with a full rescan at every step
+            for contact_id in history:
+                expected = scorer.calculate(contact_id, known(contact_id, now), reference_time=now).tier
+                assert scheduler.tier_of(contact_id) == expected, (contact_id, now)
+    
+    # Decay-driven changes are stamped with the instant they happen (to within
+    # float rounding at the threshold)
+    drops = [c for c in changes if TIERS.index(c.new_tier) < TIERS.index(c.old_tier)]
+    for change in drops:
+        signals = known(change.contact_id, change.at)
+        before = scorer.calculate(change.contact_id, signals, reference_time=change.at - timedelta(seconds=1))
+        after = scorer.calculate(change.contact_id, signals, reference_time=change.at + RETRY_DELAY)
+        assert (before.tier, after.tier) == (change.old_tier, change.new_tier), change
+    
+    print(f"\n{len(changes)} tier changes ({len(drops)} from decay or lapsed boosts)")
+    print(f"First: {changes[0].to_dict()}")
+    print(f"Next scheduled check: {scheduler.next_event_time()}")
+    
+    print("\n✓ Tier scheduler working")
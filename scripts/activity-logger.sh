@@ -3,6 +3,7 @@
 # Usage: activity-logger.sh <category> <action> <details>
 
 ACTIVITY_LOG="/root/clawd/logs/activity.jsonl"
+ACTIVITY_SOCK="/root/clawd/logs/activity.sock"
 mkdir -p /root/clawd/logs
 
 TIMESTAMP=$(date -u '+%Y-%m-%dT%H:%M:%SZ')
@@ -12,8 +13,8 @@ ACTION="${2:-unknown}"
 DETAILS="${3:-}"
 SESSION_ID="${SESSION_ID:-$(date +%Y%m%d)}"
 
-# Create JSON entry
-JSON=$(jq -n \
+# Create JSON entry (one line, so it is valid JSONL)
+JSON=$(jq -cn \
   --arg ts "$TIMESTAMP" \
   --arg agent "$AGENT" \
   --arg session "$SESSION_ID" \
@@ -22,8 +23,10 @@ JSON=$(jq -n \
   --arg details "$DETAILS" \
   '{timestamp: $ts, agent: $agent, session: $session, category: $cat, action: $action, details: $details}')
 
-# Append to log
-echo "$JSON" >> "$ACTIVITY_LOG"
+# Hand off to the ingest daemon if it is running, else append directly
+if ! { [ -S "$ACTIVITY_SOCK" ] && printf '%s\n' "$JSON" | nc -U -N "$ACTIVITY_SOCK" 2>/dev/null; }; then
+  echo "$JSON" >> "$ACTIVITY_LOG"
+fi
 
 # Also append human-readable to daily notes
 DAILY_LOG="/root/clawd/memory/$(date +%Y-%m-%d).md"
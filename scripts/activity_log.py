@@ -4,16 +4,36 @@ Activity Logger — Structured logging for agent actions
 Supports local JSONL + Notion sync
 """
 
+import gzip
 import json
 import os
+import selectors
+import signal
+import socket
+import shutil
 import sys
+import time
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 
 # Paths
 LOG_DIR = Path("/root/clawd/logs")
 ACTIVITY_LOG = LOG_DIR / "activity.jsonl"
-LOG_DIR.mkdir(exist_ok=True)
+ACTIVITY_INDEX = LOG_DIR / "activity.jsonl.idx"
+ACTIVITY_ROLLUP = LOG_DIR / "activity.rollup.json"
+ACTIVITY_SOCKET = LOG_DIR / "activity.sock"
+ARCHIVE_DIR = LOG_DIR / "archive"
+ARCHIVE_MANIFEST = ARCHIVE_DIR / "manifest.json"
+SEGMENT_DIR = LOG_DIR / "segments"
+
+# Sparse index: one "<timestamp> <offset>" line per INDEX_STRIDE bytes of log
+INDEX_STRIDE = 256 * 1024
+
+# Rotation: close the live file at this size or once it holds a past day
+ROTATE_MAX_BYTES = 64 * 1024 * 1024
+ROTATE_GRACE_SECONDS = 1.0   # let in-flight appends land before compressing
 
 # Activity categories
 CATEGORIES = {
@@ -25,90 +45,897 @@ CATEGORIES = {
     "human": "Human interactions (request, response)",
 }
 
-def log_activity(
+def _new_entry(
     category: str,
     action: str,
     details: str = "",
     outcome: str = "success",
     agent: str = "oracle",
-    metadata: dict = None
+    metadata: dict = None,
+    timestamp: str = None,
+    session: str = None,
 ):
-    """Log an activity entry."""
-    
-    entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+    """Build an activity entry dict."""
+    return {
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
         "agent": agent,
-        "session": os.environ.get("SESSION_ID", datetime.now().strftime("%Y%m%d")),
+        "session": session or os.environ.get("SESSION_ID", datetime.now().strftime("%Y%m%d")),
         "category": category,
         "action": action,
         "details": details,
         "outcome": outcome,
         "metadata": metadata or {}
     }
+
+_log_dir_ready = False
+
+def _append_entries(entries: list):
+    """Append entries to the JSONL log in one write and update the index."""
+    global _log_dir_ready
+    if not _log_dir_ready:
+        LOG_DIR.mkdir(exist_ok=True)
+        _log_dir_ready = True
     
-    # Append to JSONL
-    with open(ACTIVITY_LOG, "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    lines = [(json.dumps(e) + "\n").encode() for e in entries]
+    data = b"".join(lines)
+    with open(ACTIVITY_LOG, "ab") as f:
+        f.write(data)
+        offset = f.tell() - len(data)
+    
+    points = []
+    last = _last_indexed_offset()
+    for entry, line in zip(entries, lines):
+        if last is None or not last <= offset < last + INDEX_STRIDE:
+            points.append(f"{entry['timestamp']} {offset}\n")
+            last = offset
+        offset += len(line)
+    if points:
+        with open(ACTIVITY_INDEX, "a") as f:
+            f.writelines(points)
+
+def log_activity(
+    category: str,
+    action: str,
+    details: str = "",
+    outcome: str = "success",
+    agent: str = "oracle",
+    metadata: dict = None
+):
+    """Log an activity entry."""
+    
+    entry = _new_entry(category, action, details, outcome, agent, metadata)
+    _append_entries([entry])
     
     return entry
 
+def _read_index():
+    """Load the sidecar index as parallel (timestamps, offsets) lists."""
+    timestamps, offsets = [], []
+    if not ACTIVITY_INDEX.exists():
+        return timestamps, offsets
+    with open(ACTIVITY_INDEX) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                timestamps.append(parts[0])
+                offsets.append(int(parts[1]))
+    return timestamps, offsets
+
+def _last_indexed_offset():
+    """Offset of the last index point, or None if the index is empty."""
+    if not ACTIVITY_INDEX.exists():
+        return None
+    with open(ACTIVITY_INDEX, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 256))
+        lines = f.read().split()
+    return int(lines[-1]) if lines and lines[-1].isdigit() else None
+
+def rebuild_index():
+    """Regenerate the sidecar index from the full log. Returns index points."""
+    points = []
+    if ACTIVITY_LOG.exists():
+        offset = 0
+        last = None
+        with open(ACTIVITY_LOG, "rb") as f:
+            for line in f:
+                ts = _line_timestamp(line)
+                if ts and (last is None or offset >= last + INDEX_STRIDE):
+                    points.append(f"{ts} {offset}\n")
+                    last = offset
+                offset += len(line)
+    
+    LOG_DIR.mkdir(exist_ok=True)
+    tmp = ACTIVITY_INDEX.with_suffix(".idx.tmp")
+    with open(tmp, "w") as f:
+        f.writelines(points)
+    os.replace(tmp, ACTIVITY_INDEX)
+    return len(points)
+
+def _offset_since(since: str) -> int:
+    """
+    Byte offset at or before the first entry with timestamp >= since.
+    
+    Falls back to 0 if there is no index or it does not match the log.
+    """
+    if not since:
+        return 0
+    timestamps, offsets = _read_index()
+    if not offsets or offsets[-1] > ACTIVITY_LOG.stat().st_size:
+        return 0
+    i = bisect_left(timestamps, since)
+    return offsets[i - 1] if i > 0 else 0
+
+# Reverse-scan block size for query_activities
+READ_BLOCK_SIZE = 64 * 1024
+
+def _iter_lines_reverse(path: Path, start: int = 0, block_size: int = READ_BLOCK_SIZE):
+    """Yield raw lines of a file after `start`, last line first, reading backwards in blocks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > start:
+            step = min(block_size, pos - start)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if tail:
+            yield tail
+
+def _line_timestamp(line: bytes):
+    """Extract the timestamp field from a raw line without parsing JSON."""
+    start = line.find(b'"timestamp":')
+    if start < 0:
+        return None
+    start = line.find(b'"', start + len(b'"timestamp":'))
+    end = line.find(b'"', start + 1)
+    if start < 0 or end < 0:
+        return None
+    return line[start + 1:end].decode("ascii", "replace")
+
+def _prefilter(*values):
+    """Byte needles a line must contain for each filter value to match."""
+    return [
+        {json.dumps(v).encode(), json.dumps(v, ensure_ascii=False).encode()}
+        for v in values if v
+    ]
+
+def _match_line(line: bytes, needles: list, since: str = None, **filters):
+    """Parse a raw line if it passes the prefilter and all filters, else None."""
+    # Cheap byte-level rejection before full JSON parsing
+    if not all(any(n in line for n in alts) for alts in needles):
+        return None
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+    for name, value in filters.items():
+        if value and entry.get(name) != value:
+            return None
+    if since and entry.get("timestamp", "") < since:
+        return None
+    return entry
+
 def query_activities(
     category: str = None,
     since: str = None,
     agent: str = None,
-    limit: int = 50
+    limit: int = 50,
+    outcome: str = None
 ):
-    """Query activity log with filters."""
+    """
+    Query activity log with filters.
     
-    if not ACTIVITY_LOG.exists():
-        return []
+    Scans from the end of the live file and stops once `limit` matches are
+    found or an entry older than `since` is reached (the log is
+    append-ordered); the sidecar index bounds the scan to the slice that can
+    match `since`. Older entries come from rotated segments, then the
+    columnar archive. Returns matches oldest first; limit=0/None returns
+    every match.
+    """
     
+    filters = {"category": category, "agent": agent, "outcome": outcome}
+    needles = _prefilter(category, agent, outcome)
     results = []
-    with open(ACTIVITY_LOG) as f:
-        for line in f:
-            try:
-                entry = json.loads(line.strip())
-                
-                # Apply filters
-                if category and entry.get("category") != category:
-                    continue
-                if agent and entry.get("agent") != agent:
-                    continue
-                if since and entry.get("timestamp", "") < since:
-                    continue
-                
+    reached_since = False
+    
+    def full():
+        return bool(limit) and len(results) >= limit
+    
+    if ACTIVITY_LOG.exists():
+        start = max(_archived_offset(), _offset_since(since))
+        for line in _iter_lines_reverse(ACTIVITY_LOG, start=start):
+            if since:
+                ts = _line_timestamp(line)
+                if ts is not None and ts < since:
+                    reached_since = True
+                    break
+            entry = _match_line(line, needles, since, **filters)
+            if entry is not None:
                 results.append(entry)
-            except json.JSONDecodeError:
-                continue
+                if full():
+                    break
+    
+    # Segments decompress forwards, so keep only the newest matches of each
+    for path in _segments(newest_first=True):
+        if reached_since or full():
+            break
+        first, last = _segment_bounds(path)
+        if since and last and last < _sortable(since):
+            break
+        reached_since = bool(since and first and first < _sortable(since))
+        matches = deque(maxlen=(limit - len(results)) if limit else None)
+        with _open_segment(path) as f:
+            for line in f:
+                entry = _match_line(line, needles, since, **filters)
+                if entry is not None:
+                    matches.append(entry)
+        results.extend(reversed(matches))
+    
+    if not reached_since and not full():
+        for part in _archive_parts(newest_first=True, since=since):
+            lines = part.select(since=since, **filters)
+            if limit:
+                lines = lines[-(limit - len(results)):]
+            results.extend(json.loads(line) for line in reversed(lines))
+            if full():
+                break
+    
+    results.reverse()
+    return results
+
+def _empty_rollup():
+    return {"total": 0, "by_agent": {}, "by_category": {}, "by_outcome": {}}
+
+def _bump(counts: dict, key: str):
+    counts[key] = counts.get(key, 0) + 1
+
+def _fold_lines(days: dict, lines) -> int:
+    """Count complete raw lines into per-day rollups; returns bytes consumed."""
+    consumed = 0
+    for line in lines:
+        if not line.endswith(b"\n"):
+            break  # Partial write; pick it up next time
+        consumed += len(line)
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(entry, dict) or not entry.get("timestamp"):
+            continue
+        
+        day = days.setdefault(entry["timestamp"][:10], _empty_rollup())
+        day["total"] += 1
+        _bump(day["by_agent"], entry.get("agent", "unknown"))
+        _bump(day["by_category"], entry.get("category", "unknown"))
+        _bump(day["by_outcome"], entry.get("outcome", "unknown"))
+    return consumed
+
+def _load_rollups():
+    state = {"offset": 0, "log_inode": None, "days": {}}
+    if ACTIVITY_ROLLUP.exists():
+        try:
+            with open(ACTIVITY_ROLLUP) as f:
+                state.update(json.load(f))
+        except (json.JSONDecodeError, OSError):
+            pass
+    return state
+
+def _save_rollups(state: dict):
+    LOG_DIR.mkdir(exist_ok=True)
+    tmp = ACTIVITY_ROLLUP.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, ACTIVITY_ROLLUP)
+
+def update_rollups():
+    """
+    Fold new log lines into the per-day rollup counters.
+    
+    The rollup file stores the byte offset it has processed up to, so each
+    call only reads lines appended since the last one. Returns the state.
+    """
+    state = _load_rollups()
+    live = ACTIVITY_LOG.stat() if ACTIVITY_LOG.exists() else None
+    
+    if live and state["log_inode"] not in (None, live.st_ino):
+        # Rotated: rotate_log() folded the old file's tail already
+        state["offset"] = 0
+    elif live and state["offset"] > live.st_size:
+        # Log was truncated; recount from scratch
+        state = {"offset": 0, "log_inode": None, "days": {}}
+    
+    fresh = state["offset"] == 0 and not state["days"]
+    if fresh:
+        # Seed archived days and segments, then count the live tail
+        for part in _archive_parts():
+            counts = part.counts()
+            day = state["days"].setdefault(part.day, _empty_rollup())
+            day["total"] += counts["total"]
+            for key in ("by_agent", "by_category", "by_outcome"):
+                for name, n in counts[key].items():
+                    day[key][name] = day[key].get(name, 0) + n
+        for path in _segments():
+            with _open_segment(path) as f:
+                _fold_lines(state["days"], f)
+        state["offset"] = _archived_offset()
+    
+    if live and state["offset"] < live.st_size:
+        state["log_inode"] = live.st_ino
+        with open(ACTIVITY_LOG, "rb") as f:
+            f.seek(state["offset"])
+            state["offset"] += _fold_lines(state["days"], f)
+    elif not fresh:
+        return state
     
-    return results[-limit:]
+    _save_rollups(state)
+    return state
+
+def rollup_range(start: str, end: str = None):
+    """Per-day rollups for days in [start, end] (YYYY-MM-DD, inclusive)."""
+    end = end or start
+    days = update_rollups()["days"]
+    return {day: days[day] for day in sorted(days) if start <= day <= end}
 
 def summarize_today():
     """Get summary of today's activities."""
     
     today = datetime.now().strftime("%Y-%m-%d")
-    activities = query_activities(since=today)
     
     summary = {
-        "total": len(activities),
+        "total": 0,
         "by_category": {},
         "by_outcome": {"success": 0, "failure": 0, "pending": 0}
     }
     
-    for a in activities:
-        cat = a.get("category", "unknown")
-        outcome = a.get("outcome", "unknown")
-        
-        summary["by_category"][cat] = summary["by_category"].get(cat, 0) + 1
-        if outcome in summary["by_outcome"]:
-            summary["by_outcome"][outcome] += 1
+    # Matches the original `timestamp >= today` filter, read from rollups
+    for day, counts in update_rollups()["days"].items():
+        if day < today:
+            continue
+        summary["total"] += counts["total"]
+        for cat, n in counts["by_category"].items():
+            summary["by_category"][cat] = summary["by_category"].get(cat, 0) + n
+        for outcome, n in counts["by_outcome"].items():
+            if outcome in summary["by_outcome"]:
+                summary["by_outcome"][outcome] += n
     
     return summary
 
+# Rotated segments: closed chunks of the live log, compressed
+def _compression() -> str:
+    """'zst' if zstandard is installed, else 'gz'."""
+    try:
+        import zstandard  # noqa: F401
+        return "zst"
+    except ImportError:
+        return "gz"
+
+def _open_segment(path: Path, mode: str = "rb", suffix: str = None):
+    """Open a segment, compressing/decompressing transparently by suffix."""
+    suffix = suffix or path.suffix
+    if suffix == ".gz":
+        return gzip.open(path, mode)
+    if suffix == ".zst":
+        import zstandard
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+def _sortable(ts: str) -> str:
+    """Timestamp reduced to a filename-safe, still sortable key."""
+    return "".join(c for c in ts if c.isalnum())
+
+def _segment_bounds(path: Path):
+    """(first, last) sortable timestamps from a segment name, if closed."""
+    stem = path.name.split(".")[0][len("activity-"):]
+    if "--" not in stem:
+        return None, None  # Rotation still in flight
+    first, last = stem.split("--")
+    return first, last
+
+def _segments(newest_first: bool = False) -> list:
+    """Segments in log order; in-flight rotations ('~' names) sort last."""
+    if not SEGMENT_DIR.exists():
+        return []
+    segments = sorted(SEGMENT_DIR.glob("activity-*.jsonl*"))
+    segments = [p for p in segments if not p.name.endswith(".tmp")]
+    return segments[::-1] if newest_first else segments
+
+def _first_timestamp(path: Path, start: int = 0):
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            ts = _line_timestamp(line)
+            if ts:
+                return ts
+    return None
+
+def rotate_log(
+    max_bytes: int = ROTATE_MAX_BYTES,
+    grace: float = ROTATE_GRACE_SECONDS,
+    force: bool = False,
+):
+    """
+    Close the live log into a compressed segment if it is due.
+    
+    Due means at least `max_bytes`, or holding entries from before today
+    (UTC). The archived head of the file is dropped, rollups are caught up
+    first, and the sidecar index starts over with the new live file.
+    Returns the segment path, or None if nothing was rotated.
+    """
+    if not ACTIVITY_LOG.exists():
+        return None
+    
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    start = _archived_offset()
+    size = ACTIVITY_LOG.stat().st_size
+    first = _first_timestamp(ACTIVITY_LOG, start)
+    if not force and size < max_bytes and not (first and first[:10] < today):
+        return None
+    
+    update_rollups()
+    SEGMENT_DIR.mkdir(parents=True, exist_ok=True)
+    rotating = SEGMENT_DIR / f"activity-~{time.time_ns()}.jsonl"
+    os.rename(ACTIVITY_LOG, rotating)
+    if ACTIVITY_INDEX.exists():
+        ACTIVITY_INDEX.unlink()
+    # The archived head belonged to the old file; the next live file (which
+    # may reuse its inode) starts with nothing archived
+    _write_manifest({**_read_manifest(), "log_inode": None, "offset": 0, "first": None})
+    time.sleep(grace)
+    
+    # Count anything appended to the old file after the catch-up
+    state = _load_rollups()
+    if state["log_inode"] == rotating.stat().st_ino:
+        with open(rotating, "rb") as f:
+            f.seek(state["offset"])
+            _fold_lines(state["days"], f)
+    state["offset"], state["log_inode"] = 0, None
+    _save_rollups(state)
+    
+    # Re-read the bounds: entries may have landed during the grace period
+    first = _first_timestamp(rotating, start)
+    last = next(
+        (ts for ts in map(_line_timestamp, _iter_lines_reverse(rotating, start)) if ts),
+        None,
+    )
+    if not first or not last:
+        # Nothing past the archived head: the whole file is in the archive
+        rotating.unlink()
+        return None
+    
+    segment = SEGMENT_DIR / f"activity-{_sortable(first)}--{_sortable(last)}.jsonl.{_compression()}"
+    tmp = segment.with_name(segment.name + ".tmp")
+    with open(rotating, "rb") as src, _open_segment(tmp, "wb", segment.suffix) as dst:
+        src.seek(start)
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp, segment)
+    rotating.unlink()
+    return segment
+
+# Columnar archive of closed days: parquet with pyarrow, else numpy columns
+ARCHIVE_COLUMNS = ("agent", "category", "outcome")
+
+def _columnar_backend():
+    """'parquet' if pyarrow is installed, 'numpy' if numpy is, else None."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return "parquet"
+    except ImportError:
+        pass
+    try:
+        import numpy  # noqa: F401
+        return "numpy"
+    except ImportError:
+        return None
+
+def _read_manifest():
+    if ARCHIVE_MANIFEST.exists():
+        with open(ARCHIVE_MANIFEST) as f:
+            return json.load(f)
+    return {"log_inode": None, "offset": 0, "first": None}
+
+def _write_manifest(manifest: dict):
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = ARCHIVE_MANIFEST.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, ARCHIVE_MANIFEST)
+
+def _archived_offset() -> int:
+    """
+    Bytes at the head of the live log already held in the archive.
+    
+    The manifest is only trusted for the same file: same inode, offset
+    within the file on a line boundary, and the same first entry (inodes
+    are reused once a rotated file is deleted).
+    """
+    manifest = _read_manifest()
+    offset = manifest.get("offset", 0)
+    if not offset or not ACTIVITY_LOG.exists():
+        return 0
+    stat = ACTIVITY_LOG.stat()
+    if manifest["log_inode"] != stat.st_ino or offset > stat.st_size:
+        return 0
+    with open(ACTIVITY_LOG, "rb") as f:
+        f.seek(offset - 1)
+        if f.read(1) != b"\n":
+            return 0
+    if "first" in manifest and _first_timestamp(ACTIVITY_LOG) != manifest["first"]:
+        return 0
+    return offset
+
+class _ArchivePart:
+    """One archived run of entries for a single day."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.day = path.parent.name
+        self.is_parquet = path.suffix == ".parquet"
+    
+    def select(self, since: str = None, **filters) -> list:
+        """Raw lines matching equality filters and `since`, in log order."""
+        filters = {name: value for name, value in filters.items() if value}
+        
+        if self.is_parquet:
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+            part = pq.ParquetFile(self.path)
+            columns = list(filters) + (["timestamp"] if since else [])
+            if not columns:
+                return part.read(columns=["raw"]).column("raw").to_pylist()
+            table = part.read(columns=columns)
+            mask = None
+            for name, value in filters.items():
+                match = pc.equal(pc.cast(table.column(name), "string"), value)
+                mask = match if mask is None else pc.and_(mask, match)
+            if since:
+                match = pc.greater_equal(table.column("timestamp"), since)
+                mask = match if mask is None else pc.and_(mask, match)
+            if not pc.any(mask).as_py():
+                return []
+            raw = part.read(columns=["raw"]).column("raw")
+            return raw.filter(mask).to_pylist()
+        
+        import numpy as np
+        with open(self.path / "vocab.json") as f:
+            vocab = json.load(f)
+        mask = None
+        for name, value in filters.items():
+            if value not in vocab[name]:
+                return []
+            match = np.load(self.path / f"{name}.npy") == vocab[name].index(value)
+            mask = match if mask is None else mask & match
+        if since:
+            match = np.load(self.path / "timestamp.npy") >= since.encode()
+            mask = match if mask is None else mask & match
+        
+        offsets = np.load(self.path / "offsets.npy")
+        rows = range(len(offsets) - 1) if mask is None else np.nonzero(mask)[0]
+        lines = []
+        with open(self.path / "raw.jsonl", "rb") as f:
+            for i in rows:
+                f.seek(offsets[i])
+                lines.append(f.read(offsets[i + 1] - offsets[i]))
+        return lines
+    
+    def counts(self) -> dict:
+        """Rollup counters for this part."""
+        rollup = _empty_rollup()
+        if self.is_parquet:
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+            table = pq.read_table(self.path, columns=list(ARCHIVE_COLUMNS))
+            rollup["total"] = table.num_rows
+            for name in ARCHIVE_COLUMNS:
+                column = pc.cast(table.column(name), "string")
+                rollup[f"by_{name}"] = {
+                    item["values"]: item["counts"]
+                    for item in pc.value_counts(column).to_pylist()
+                }
+            return rollup
+        
+        import numpy as np
+        with open(self.path / "vocab.json") as f:
+            vocab = json.load(f)
+        for name in ARCHIVE_COLUMNS:
+            counts = np.bincount(np.load(self.path / f"{name}.npy"), minlength=len(vocab[name]))
+            rollup[f"by_{name}"] = {
+                vocab[name][i]: int(n) for i, n in enumerate(counts) if n
+            }
+        rollup["total"] = int(counts.sum())
+        return rollup
+
+def _archive_parts(newest_first: bool = False, since: str = None) -> list:
+    """Archive parts in log order, skipping whole days before `since`."""
+    if not ARCHIVE_DIR.exists():
+        return []
+    parts = []
+    for day_dir in sorted(p for p in ARCHIVE_DIR.iterdir() if p.is_dir()):
+        if since and day_dir.name < since[:10]:
+            continue
+        parts.extend(sorted(day_dir.glob("part-*")))
+    parts = [_ArchivePart(p) for p in parts]
+    return parts[::-1] if newest_first else parts
+
+def _write_part(path: Path, rows: list, backend: str):
+    """Write (entry, raw line) rows as one columnar part."""
+    import numpy as np
+    values = {
+        name: [str(e.get(name, "unknown")) for e, _ in rows]
+        for name in ARCHIVE_COLUMNS
+    }
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if backend == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({
+            "timestamp": [e["timestamp"] for e, _ in rows],
+            **{name: pa.array(v).dictionary_encode() for name, v in values.items()},
+            "raw": pa.array([raw for _, raw in rows], type=pa.binary()),
+        })
+        pq.write_table(table, path.with_suffix(".parquet"))
+        return
+    
+    path.mkdir(parents=True, exist_ok=True)
+    vocab = {}
+    for name, column in values.items():
+        vocab[name] = sorted(set(column))
+        lookup = {v: i for i, v in enumerate(vocab[name])}
+        np.save(path / f"{name}.npy", np.array([lookup[v] for v in column], dtype=np.uint32))
+    with open(path / "vocab.json", "w") as f:
+        json.dump(vocab, f)
+    np.save(path / "timestamp.npy", np.array([e["timestamp"].encode() for e, _ in rows]))
+    np.save(path / "offsets.npy", np.cumsum([0] + [len(raw) for _, raw in rows], dtype=np.int64))
+    with open(path / "raw.jsonl", "wb") as f:
+        f.writelines(raw for _, raw in rows)
+
+def _archive_rows(by_day: dict, line: bytes):
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return
+    if isinstance(entry, dict) and entry.get("timestamp"):
+        by_day.setdefault(entry["timestamp"][:10], []).append((entry, line))
+
+def archive_closed_days():
+    """
+    Move closed (before today, UTC) days into the archive.
+    
+    Closed segments are archived whole and removed. The live file is not
+    rewritten: the manifest records how many bytes at its head are
+    archived, and readers start after that offset.
+    Returns {day: entries archived}.
+    """
+    backend = _columnar_backend()
+    if backend is None:
+        raise RuntimeError("Archiving needs pyarrow or numpy installed")
+    
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    archived = {}
+    
+    def write(by_day: dict):
+        # Parts are named by their first timestamp so they sort in log order
+        for day, rows in by_day.items():
+            name = f"part-{_sortable(rows[0][0]['timestamp'])}"
+            _write_part(ARCHIVE_DIR / day / name, rows, backend)
+            archived[day] = archived.get(day, 0) + len(rows)
+    
+    for path in _segments():
+        first, last = _segment_bounds(path)
+        if not last or last[:8] >= _sortable(today):
+            continue
+        by_day = {}
+        with _open_segment(path) as f:
+            for line in f:
+                _archive_rows(by_day, line)
+        write(by_day)
+        path.unlink()
+    
+    if not ACTIVITY_LOG.exists():
+        return archived
+    
+    start = _archived_offset()
+    offset = start
+    by_day = {}
+    with open(ACTIVITY_LOG, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            ts = _line_timestamp(line)
+            if ts is not None and ts[:10] >= today:
+                break
+            offset += len(line)
+            _archive_rows(by_day, line)
+    write(by_day)
+    
+    _write_manifest({
+        "log_inode": ACTIVITY_LOG.stat().st_ino,
+        "offset": offset,
+        "first": _first_timestamp(ACTIVITY_LOG),
+        "format": backend,
+    })
+    return archived
+
+# Ingest daemon: newline-delimited JSON entries over a Unix socket
+DAEMON_FLUSH_INTERVAL = 0.05   # seconds an entry may sit in the buffer
+DAEMON_MAX_BATCH = 1000        # flush early once this many are buffered
+_ENTRY_FIELDS = (
+    "category", "action", "details", "outcome", "agent", "metadata", "timestamp", "session",
+)
+
+def run_daemon(
+    socket_path: Path = ACTIVITY_SOCKET,
+    flush_interval: float = DAEMON_FLUSH_INTERVAL,
+    max_batch: int = DAEMON_MAX_BATCH,
+):
+    """
+    Serve activity ingest on a Unix domain socket.
+    
+    Clients send one JSON object per line (log_activity fields, optionally
+    with timestamp/session). Entries are buffered and appended in batches;
+    the buffer is flushed on SIGTERM/SIGINT before exiting.
+    """
+    LOG_DIR.mkdir(exist_ok=True)
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        socket_path.unlink()
+    
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(128)
+    server.setblocking(False)
+    
+    sel = selectors.DefaultSelector()
+    sel.register(server, selectors.EVENT_READ)
+    pending = []
+    deadline = None
+    stopping = []
+    
+    def stop(signum, frame):
+        stopping.append(signum)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    def ingest(line: bytes):
+        try:
+            fields = json.loads(line)
+            entry = _new_entry(**{k: fields[k] for k in _ENTRY_FIELDS if k in fields})
+        except (json.JSONDecodeError, TypeError, KeyError, AttributeError):
+            return
+        pending.append(entry)
+    
+    try:
+        while not stopping:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else 1.0
+            for key, _ in sel.select(timeout):
+                if key.fileobj is server:
+                    try:
+                        conn, _ = server.accept()
+                    except BlockingIOError:
+                        continue
+                    conn.setblocking(False)
+                    sel.register(conn, selectors.EVENT_READ, bytearray())
+                    continue
+                
+                conn, buf = key.fileobj, key.data
+                try:
+                    data = conn.recv(65536)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError:
+                    data = b""
+                if data:
+                    buf += data
+                    *lines, rest = buf.split(b"\n")
+                    buf[:] = rest
+                else:
+                    lines = [bytes(buf)] if buf.strip() else []
+                    sel.unregister(conn)
+                    conn.close()
+                for line in lines:
+                    ingest(line)
+            
+            if pending and deadline is None:
+                deadline = time.monotonic() + flush_interval
+            if pending and (len(pending) >= max_batch or time.monotonic() >= deadline):
+                _append_entries(pending)
+                pending = []
+                deadline = None
+                if ACTIVITY_LOG.stat().st_size >= ROTATE_MAX_BYTES:
+                    rotate_log(grace=0)
+    finally:
+        if pending:
+            _append_entries(pending)
+        sel.close()
+        server.close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+_client_sock = None
+
+def send_activity(
+    category: str,
+    action: str,
+    details: str = "",
+    outcome: str = "success",
+    agent: str = "oracle",
+    metadata: dict = None
+):
+    """
+    Log an activity entry through the ingest daemon.
+    
+    Keeps one connection open per process and falls back to a direct
+    append (like log_activity) if the daemon is not running.
+    """
+    global _client_sock
+    entry = _new_entry(category, action, details, outcome, agent, metadata)
+    data = (json.dumps(entry) + "\n").encode()
+    
+    if _client_sock is not None:
+        try:
+            _client_sock.sendall(data)
+            return entry
+        except OSError:
+            # Daemon restarted; reconnect below
+            _client_sock.close()
+            _client_sock = None
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(ACTIVITY_SOCKET))
+        sock.sendall(data)
+        _client_sock = sock
+        return entry
+    except OSError:
+        sock.close()
+    
+    _append_entries([entry])
+    return entry
+
 # CLI interface
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["reindex"]:
+        points = rebuild_index()
+        print(f"✅ Rebuilt index: {points} points")
+        sys.exit(0)
+    
+    if sys.argv[1:2] == ["archive"]:
+        archived = archive_closed_days()
+        print(f"✅ Archived {sum(archived.values())} entries over {len(archived)} days")
+        sys.exit(0)
+    
+    if sys.argv[1:2] == ["rotate"]:
+        segment = rotate_log(force="--force" in sys.argv)
+        print(f"✅ Rotated to {segment}" if segment else "Nothing to rotate")
+        sys.exit(0)
+    
+    if sys.argv[1:2] == ["daemon"]:
+        run_daemon()
+        sys.exit(0)
+    
+    if sys.argv[1:2] == ["rollup"]:
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        start = sys.argv[2] if len(sys.argv) > 2 else today
+        end = sys.argv[3] if len(sys.argv) > 3 else start
+        print(json.dumps(rollup_range(start, end), indent=2))
+        sys.exit(0)
+    
     if len(sys.argv) < 3:
         print("Usage: activity_log.py <category> <action> [details] [outcome]")
+        print("       activity_log.py reindex")
+        print("       activity_log.py rollup [start-date] [end-date]")
+        print("       activity_log.py daemon")
+        print("       activity_log.py archive")
+        print("       activity_log.py rotate [--force]")
         print(f"Categories: {', '.join(CATEGORIES.keys())}")
         sys.exit(1)
     
@@ -117,5 +944,5 @@ if __name__ == "__main__":
     details = sys.argv[3] if len(sys.argv) > 3 else ""
     outcome = sys.argv[4] if len(sys.argv) > 4 else "success"
     
-    entry = log_activity(category, action, details, outcome)
+    entry = send_activity(category, action, details, outcome)
     print(f"✅ Logged: {category}/{action} ({outcome})")